@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+On-disk TTL cache for JSON API responses
+Entries are gzip-compressed JSON files keyed by endpoint and parameters, so repeat runs skip the network
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+class FileCache:
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, endpoint, params):
+        key = endpoint + json.dumps(sorted((params or {}).items()), default=str)
+        return os.path.join(self.cache_dir, hashlib.md5(key.encode('utf-8')).hexdigest() + '.json.gz')
+
+    def get(self, endpoint, params=None, ttl=None):
+        """
+        Cached value for the request, or None if it is missing or older than `ttl` seconds (None = never expires)
+        """
+        path = self._path(endpoint, params)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if ttl is not None and time.time() - entry['timestamp'] > ttl:
+            return None
+        return entry['value']
+
+    def set(self, endpoint, params, value):
+        """Store a JSON-serializable value; a write failure only costs the cache entry"""
+        path = self._path(endpoint, params)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'timestamp': time.time(), 'value': value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Could not write cache {path}: {e}")
+
+    def get_or_fetch(self, endpoint, params, ttl, fetch):
+        """
+        Return the cached value if fresh, otherwise call `fetch()` and cache its result
+        `fetch` returns None on failure, which is passed through and not cached
+        """
+        value = self.get(endpoint, params, ttl)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(endpoint, params, value)
+        return value
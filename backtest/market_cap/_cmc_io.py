@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Shared CoinMarketCap CSV loading for the market cap analysis scripts
+Parsed frames are memoized per file version so debug and analysis runs in one session parse each CSV once
+"""
+
+import os
+from functools import lru_cache
+import pandas as pd
+
+# pyarrow's CSV reader is used when available, otherwise pandas' C engine
+PYARROW_AVAILABLE = True
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Only the columns the analyses use are parsed
+CMC_COLUMNS = ['timestamp', 'close', 'marketCap', 'volume']
+
+# One-shot pandas parse: typed columns and ISO8601 timestamps at load time
+_READ_KWARGS = dict(
+    delimiter=';',
+    usecols=CMC_COLUMNS,
+    dtype={'close': 'float64', 'marketCap': 'float64', 'volume': 'float64'},
+    parse_dates=['timestamp'],
+    date_format='ISO8601',
+    cache_dates=True,
+    engine='c',
+    memory_map=True
+)
+
+
+def read_cmc_csv(path):
+    """
+    Read a CoinMarketCap CSV export with a parsed (UTC) timestamp column
+    """
+    if PYARROW_AVAILABLE:
+        # Quotes are stripped and timestamps typed during parsing
+        table = pacsv.read_csv(
+            path,
+            parse_options=pacsv.ParseOptions(delimiter=';', quote_char='"'),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=CMC_COLUMNS,
+                column_types={
+                    'timestamp': pa.timestamp('ns', tz='UTC'),
+                    'close': pa.float64(),
+                    'marketCap': pa.float64(),
+                    'volume': pa.float64()
+                }
+            )
+        )
+        return table.to_pandas()
+    
+    # The C tokenizer drops the surrounding quotes, so timestamps parse directly
+    return pd.read_csv(path, **_READ_KWARGS)
+
+
+def load_cached(path):
+    """
+    Load a CSV through a sidecar .feather cache that is rebuilt whenever the CSV is newer
+    """
+    if not PYARROW_AVAILABLE:
+        return read_cmc_csv(path)
+    
+    cache_path = path + '.feather'
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        return pd.read_feather(cache_path)
+    
+    df = read_cmc_csv(path)
+    try:
+        df.to_feather(cache_path, compression='zstd')
+    except Exception as e:
+        print(f"⚠️  Could not write cache {cache_path}: {e}")
+    return df
+
+
+def sort_by_timestamp(df):
+    """
+    Return df in ascending timestamp order, sorting only when the file is not already ordered.
+    CoinMarketCap exports are newest-first, so the common case is a cheap reversal.
+    """
+    ts = df['timestamp']
+    if ts.is_monotonic_increasing:
+        return df
+    if ts.is_monotonic_decreasing:
+        return df.iloc[::-1].reset_index(drop=True)
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
+@lru_cache(maxsize=None)
+def _parse_cached(path, mtime):
+    return sort_by_timestamp(load_cached(path))
+
+
+def parse(path):
+    """
+    Parsed CoinMarketCap frame sorted by timestamp.
+    Returns a copy so callers can add columns without touching the memoized frame.
+    """
+    return _parse_cached(path, os.path.getmtime(path)).copy()
@@ -25,14 +25,14 @@ class BTCETHAnalyzer:
         
         try:
             # Load Bitcoin data
-            btc_df = pd.read_csv(self.btc_file, delimiter=';')
-            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'))
+            btc_df = pd.read_csv(self.btc_file, delimiter=';', memory_map=True)
+            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             btc_df = btc_df.sort_values('timestamp')
             print(f"✅ BTC data: {len(btc_df)} points from {btc_df['timestamp'].min()} to {btc_df['timestamp'].max()}")
             
             # Load Ethereum data
-            eth_df = pd.read_csv(self.eth_file, delimiter=';')
-            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'))
+            eth_df = pd.read_csv(self.eth_file, delimiter=';', memory_map=True)
+            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             eth_df = eth_df.sort_values('timestamp')
             print(f"✅ ETH data: {len(eth_df)} points from {eth_df['timestamp'].min()} to {eth_df['timestamp'].max()}")
             
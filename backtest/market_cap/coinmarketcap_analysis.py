@@ -25,20 +25,20 @@ class CoinMarketCapAnalyzer:
         
         try:
             # Load Bitcoin data
-            btc_df = pd.read_csv(self.btc_file, delimiter=';')
+            btc_df = pd.read_csv(self.btc_file, delimiter=';', memory_map=True)
             print(f"✅ Bitcoin data loaded: {len(btc_df)} data points")
             
             # Load Ethereum data  
-            eth_df = pd.read_csv(self.eth_file, delimiter=';')
+            eth_df = pd.read_csv(self.eth_file, delimiter=';', memory_map=True)
             print(f"✅ Ethereum data loaded: {len(eth_df)} data points")
             
             # Process Bitcoin data
-            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'))
+            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             btc_df = btc_df.sort_values('timestamp')
             btc_df.set_index('timestamp', inplace=True)
             
             # Process Ethereum data
-            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'))
+            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             eth_df = eth_df.sort_values('timestamp')
             eth_df.set_index('timestamp', inplace=True)
             
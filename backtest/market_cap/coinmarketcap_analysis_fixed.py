@@ -6,16 +6,17 @@ Fixed version that properly handles data alignment
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+import os
+import sys
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
 class CoinMarketCapAnalyzerFixed:
-    def __init__(self):
+    def __init__(self, keep_volume=False):
         self.btc_file = "Bitcoin_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv"
         self.eth_file = "Ethereum_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv"
+        self.keep_volume = keep_volume  # Volume is not used by the analysis/chart, so it is dropped by default
         
     def load_and_process_data(self):
         """
@@ -25,14 +26,14 @@ class CoinMarketCapAnalyzerFixed:
         
         try:
             # Load Bitcoin data
-            btc_df = pd.read_csv(self.btc_file, delimiter=';')
-            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'))
+            btc_df = pd.read_csv(self.btc_file, delimiter=';', memory_map=True)
+            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             btc_df = btc_df.sort_values('timestamp')
             print(f"✅ Bitcoin data: {len(btc_df)} points from {btc_df['timestamp'].min()} to {btc_df['timestamp'].max()}")
             
             # Load Ethereum data  
-            eth_df = pd.read_csv(self.eth_file, delimiter=';')
-            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'))
+            eth_df = pd.read_csv(self.eth_file, delimiter=';', memory_map=True)
+            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'), format='ISO8601', cache=True)
             eth_df = eth_df.sort_values('timestamp')
             print(f"✅ Ethereum data: {len(eth_df)} points from {eth_df['timestamp'].min()} to {eth_df['timestamp'].max()}")
             
@@ -42,42 +43,35 @@ class CoinMarketCapAnalyzerFixed:
             
             # Group by month and take the last (latest) entry per month
             print("\n🔄 Processing monthly data...")
-            btc_monthly = btc_df.groupby('month').last().reset_index()
-            eth_monthly = eth_df.groupby('month').last().reset_index()
+            # Frames are already timestamp-sorted, so groups come out in month order without re-sorting
+            btc_monthly = btc_df.groupby('month', sort=False, as_index=False).last()
+            eth_monthly = eth_df.groupby('month', sort=False, as_index=False).last()
             
             print(f"📊 BTC monthly data: {len(btc_monthly)} months")
             print(f"📊 ETH monthly data: {len(eth_monthly)} months")
             
-            # Find common months
-            btc_months = set(btc_monthly['month'])
-            eth_months = set(eth_monthly['month'])
-            common_months = btc_months.intersection(eth_months)
+            # Align on common months with a single inner join (BTC timestamps are the reference)
+            btc_cols = {'close': 'btc_price', 'marketCap': 'btc_market_cap'}
+            eth_cols = {'close': 'eth_price', 'marketCap': 'eth_market_cap'}
+            if self.keep_volume:
+                btc_cols['volume'] = 'btc_volume'
+                eth_cols['volume'] = 'eth_volume'
             
-            print(f"📅 Common months: {len(common_months)}")
+            btc_common = btc_monthly[['month', 'timestamp', *btc_cols]].rename(columns=btc_cols)
+            eth_common = eth_monthly[['month', *eth_cols]].rename(columns=eth_cols)
+            combined_df = btc_common.merge(eth_common, on='month', how='inner')
             
-            if len(common_months) == 0:
+            print(f"📅 Common months: {len(combined_df)}")
+            
+            if len(combined_df) == 0:
                 print("❌ No common time periods found")
                 return None
             
-            # Filter to common months
-            btc_common = btc_monthly[btc_monthly['month'].isin(common_months)].copy()
-            eth_common = eth_monthly[eth_monthly['month'].isin(common_months)].copy()
-            
-            # Sort by month
-            btc_common = btc_common.sort_values('month')
-            eth_common = eth_common.sort_values('month')
-            
-            # Create aligned dataset
-            combined_df = pd.DataFrame({
-                'month': btc_common['month'].values,
-                'timestamp': btc_common['timestamp'].values,  # Use BTC timestamps as reference
-                'btc_price': btc_common['close'].values,
-                'eth_price': eth_common['close'].values,
-                'btc_market_cap': btc_common['marketCap'].values,
-                'eth_market_cap': eth_common['marketCap'].values,
-                'btc_volume': btc_common['volume'].values,
-                'eth_volume': eth_common['volume'].values
-            })
+            # Keep the original column layout
+            column_order = ['month', 'timestamp', 'btc_price', 'eth_price', 'btc_market_cap', 'eth_market_cap']
+            if self.keep_volume:
+                column_order += ['btc_volume', 'eth_volume']
+            combined_df = combined_df[column_order]
             
             # Set timestamp as index
             combined_df.set_index('timestamp', inplace=True)
@@ -150,12 +144,11 @@ class CoinMarketCapAnalyzerFixed:
         # Market position
         ratio_percentile = (current_eth_btc_ratio - min_ratio) / (max_ratio - min_ratio) * 100
         
-        if current_eth_btc_ratio > avg_ratio * 1.1:
-            strength = "STRONG 🔥"
-        elif current_eth_btc_ratio < avg_ratio * 0.9:
-            strength = "WEAK ❄️"
-        else:
-            strength = "NEUTRAL ⚖️"
+        # Classify every point against the period average: 0 = weak, 1 = neutral, 2 = strong
+        ratio_values = df['eth_btc_market_cap_ratio'].to_numpy()
+        strength_series = np.select([ratio_values > avg_ratio * 1.1, ratio_values < avg_ratio * 0.9],
+                                    [2, 0], default=1)
+        strength = ["WEAK ❄️", "NEUTRAL ⚖️", "STRONG 🔥"][strength_series[-1]]
         
         print(f"\n🔄 Market Position:")
         print(f"   ETH is {strength} vs BTC")
@@ -169,7 +162,8 @@ class CoinMarketCapAnalyzerFixed:
             'max_date': max_date,
             'min_date': min_date,
             'current_price_ratio': current_price_ratio,
-            'ratio_difference': ratio_difference
+            'ratio_difference': ratio_difference,
+            'strength_series': strength_series
         }
     
     def create_comprehensive_chart(self, df, stats):
@@ -178,8 +172,20 @@ class CoinMarketCapAnalyzerFixed:
         """
         print(f"\n📊 Creating comprehensive analysis chart...")
         
+        # Matplotlib is imported lazily so data-only runs skip its startup cost
+        import matplotlib
+        if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+            matplotlib.use('Agg')  # Headless server: avoid Tk initialization
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
+        
+        # Scale market caps to trillions once and reuse for plotting and the summary text
+        idx_vals = df.index.values
+        btc_mc_t = df['btc_market_cap'].to_numpy() * 1e-12
+        eth_mc_t = df['eth_market_cap'].to_numpy() * 1e-12
+        
         # Create 3-panel chart as requested
-        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 8))
+        fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 8), sharex=True)
         fig.suptitle(f'ETH vs BTC Market Cap Analysis: {df.index[0].strftime("%Y-%m")} to {df.index[-1].strftime("%Y-%m")} ({len(df)} Months)', 
                      fontsize=16, fontweight='bold')
         
@@ -224,9 +230,9 @@ class CoinMarketCapAnalyzerFixed:
         ax3_twin2.spines['right'].set_position(('outward', 60))
         
         # Market caps
-        line1 = ax3.plot(df.index, df['btc_market_cap'] / 1e12, 
+        line1 = ax3.plot(idx_vals, btc_mc_t, 
                         color='orange', linewidth=3, marker='o', markersize=5, label='BTC Market Cap (T USD)')
-        line2 = ax3_twin1.plot(df.index, df['eth_market_cap'] / 1e12,
+        line2 = ax3_twin1.plot(idx_vals, eth_mc_t,
                               color='blue', linewidth=3, marker='s', markersize=5, label='ETH Market Cap (T USD)')
         
         # ETH/BTC market cap ratio overlay (THE MAIN INSIGHT!)
@@ -234,6 +240,10 @@ class CoinMarketCapAnalyzerFixed:
                               color='purple', linewidth=4, alpha=0.9, linestyle='--', 
                               marker='D', markersize=6, label='ETH/BTC Market Cap Ratio')
         
+        # Color ratio points by strength vs average (red = weak, yellow = neutral, green = strong)
+        ax3_twin2.scatter(df.index, df['eth_btc_market_cap_ratio'], c=stats['strength_series'],
+                          cmap='RdYlGn', vmin=0, vmax=2, s=36, zorder=3)
+        
         ax3.set_title('Market Caps with ETH/BTC Ratio Overlay', fontsize=14, fontweight='bold')
         ax3.set_ylabel('BTC Market Cap (T USD)', fontsize=12, color='orange')
         ax3_twin1.set_ylabel('ETH Market Cap (T USD)', fontsize=12, color='blue')
@@ -263,37 +273,46 @@ class CoinMarketCapAnalyzerFixed:
                 transform=ax3.transAxes, verticalalignment='top',
                 bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
         
-        # Format x-axes
+        # Format x-axes (shared, so the locator/formatter set on ax3 applies to all panels)
+        ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+        ax3.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
         for ax in [ax1, ax2, ax3]:
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-            ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+            ax.tick_params(axis='x', labelrotation=45)
         
         # Add comprehensive statistics
-        stats_text = f"""ETH/BTC Market Cap Analysis:
-
-Data Source: CoinMarketCap Historical Data
-Period: {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}
-Data Points: {len(df)} months
-
-Current Values:
-  BTC Market Cap: ${df['btc_market_cap'].iloc[-1]/1e12:.2f}T
-  ETH Market Cap: ${df['eth_market_cap'].iloc[-1]/1e12:.2f}T
-  BTC Price: ${df['btc_price'].iloc[-1]:,.0f}
-  ETH Price: ${df['eth_price'].iloc[-1]:,.0f}
-
-Ratios:
-  ETH/BTC Market Cap: {stats['current_ratio']:.4f}
-  ETH/BTC Price: {stats['current_price_ratio']:.6f}
-  
-Historical Stats:
-  Average Ratio: {stats['avg_ratio']:.4f}
-  Maximum: {stats['max_ratio']:.4f} ({stats['max_date'].strftime('%Y-%m')})
-  Minimum: {stats['min_ratio']:.4f} ({stats['min_date'].strftime('%Y-%m')})
-  
-Key Insight:
-  Market cap ratio is {stats['ratio_difference']:+.1f}% vs price ratio
-  → {"ETH has more supply" if stats['ratio_difference'] > 0 else "BTC has more supply"}"""
+        # Pull the last-row scalars once, then assemble the summary panel
+        last_btc_p = float(df['btc_price'].iloc[-1])
+        last_eth_p = float(df['eth_price'].iloc[-1])
+        start_label = df.index[0].strftime('%Y-%m-%d')
+        end_label = df.index[-1].strftime('%Y-%m-%d')
+        supply_note = "ETH has more supply" if stats['ratio_difference'] > 0 else "BTC has more supply"
+        
+        stats_text = '\n'.join([
+            "ETH/BTC Market Cap Analysis:",
+            "",
+            "Data Source: CoinMarketCap Historical Data",
+            f"Period: {start_label} to {end_label}",
+            f"Data Points: {len(df)} months",
+            "",
+            "Current Values:",
+            f"  BTC Market Cap: ${btc_mc_t[-1]:.2f}T",
+            f"  ETH Market Cap: ${eth_mc_t[-1]:.2f}T",
+            f"  BTC Price: ${last_btc_p:,.0f}",
+            f"  ETH Price: ${last_eth_p:,.0f}",
+            "",
+            "Ratios:",
+            f"  ETH/BTC Market Cap: {stats['current_ratio']:.4f}",
+            f"  ETH/BTC Price: {stats['current_price_ratio']:.6f}",
+            "  ",
+            "Historical Stats:",
+            f"  Average Ratio: {stats['avg_ratio']:.4f}",
+            f"  Maximum: {stats['max_ratio']:.4f} ({stats['max_date'].strftime('%Y-%m')})",
+            f"  Minimum: {stats['min_ratio']:.4f} ({stats['min_date'].strftime('%Y-%m')})",
+            "  ",
+            "Key Insight:",
+            f"  Market cap ratio is {stats['ratio_difference']:+.1f}% vs price ratio",
+            f"  → {supply_note}",
+        ])
         
         fig.text(0.02, 0.02, stats_text, fontsize=9, 
                 bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8),
@@ -6,12 +6,62 @@ Uses both Ethereum files to get full coverage from May 2021 to July 2025
 
 import pandas as pd
 import numpy as np
+import sys
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from datetime import datetime
+import _cmc_io
 import warnings
 warnings.filterwarnings('ignore')
 
+# Numba is optional; without it the summary kernel runs as plain Python
+NUMBA_AVAILABLE = True
+try:
+    from numba import njit
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def summarize_ratio(a):
+    """
+    Single pass over the ratio column: (last, max, min, mean, argmax, argmin)
+    NaN values are skipped like the pandas reductions; argmax/argmin are -1 when every value is NaN.
+    """
+    mn = np.nan
+    mx = np.nan
+    imn = -1
+    imx = -1
+    total = 0.0
+    count = 0
+    for i in range(a.shape[0]):
+        x = a[i]
+        if x != x:
+            continue
+        total += x
+        count += 1
+        if imn < 0 or x < mn:
+            mn = x
+            imn = i
+        if imx < 0 or x > mx:
+            mx = x
+            imx = i
+    mean = total / count if count > 0 else np.nan
+    return a[-1], mx, mn, mean, imx, imn
+
+
+if NUMBA_AVAILABLE:
+    summarize_ratio = njit(cache=True)(summarize_ratio)
+
+def emit(lines):
+    """
+    Write buffered report lines to stdout in one call and clear the buffer
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
 class CompleteCoinMarketCapAnalyzer:
     def __init__(self):
         self.btc_file = "Bitcoin_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv"
@@ -22,163 +72,167 @@ class CompleteCoinMarketCapAnalyzer:
         """
         Load and combine all CSV files to get complete coverage
         """
-        print("📂 Loading Complete CoinMarketCap Historical Data...")
+        lines = ["📂 Loading Complete CoinMarketCap Historical Data..."]
         
         try:
             # Load Bitcoin data
-            btc_df = pd.read_csv(self.btc_file, delimiter=';')
-            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'))
-            btc_df = btc_df.sort_values('timestamp')
-            print(f"✅ Bitcoin data: {len(btc_df)} points from {btc_df['timestamp'].min()} to {btc_df['timestamp'].max()}")
+            btc_df = _cmc_io.parse(self.btc_file)
+            lines.append(f"✅ Bitcoin data: {len(btc_df)} points from {btc_df['timestamp'].min()} to {btc_df['timestamp'].max()}")
             
             # Load Ethereum data from both files
-            eth_df1 = pd.read_csv(self.eth_file1, delimiter=';')
-            eth_df1['timestamp'] = pd.to_datetime(eth_df1['timestamp'].str.strip('"'))
-            print(f"✅ Ethereum early data: {len(eth_df1)} points from {eth_df1['timestamp'].min()} to {eth_df1['timestamp'].max()}")
+            eth_df1 = _cmc_io.parse(self.eth_file1)
+            lines.append(f"✅ Ethereum early data: {len(eth_df1)} points from {eth_df1['timestamp'].min()} to {eth_df1['timestamp'].max()}")
             
-            eth_df2 = pd.read_csv(self.eth_file2, delimiter=';')
-            eth_df2['timestamp'] = pd.to_datetime(eth_df2['timestamp'].str.strip('"'))
-            print(f"✅ Ethereum later data: {len(eth_df2)} points from {eth_df2['timestamp'].min()} to {eth_df2['timestamp'].max()}")
+            eth_df2 = _cmc_io.parse(self.eth_file2)
+            lines.append(f"✅ Ethereum later data: {len(eth_df2)} points from {eth_df2['timestamp'].min()} to {eth_df2['timestamp'].max()}")
             
             # Combine Ethereum datasets
-            print("\n🔄 Combining Ethereum datasets...")
+            lines.append("\n🔄 Combining Ethereum datasets...")
             
             # Remove any overlapping dates to avoid duplicates
             overlap_start = eth_df2['timestamp'].min()
-            eth_df1_filtered = eth_df1[eth_df1['timestamp'] < overlap_start]
+            # eth_df1 is timestamp-sorted, so a binary search finds the cut point
+            cut = eth_df1['timestamp'].searchsorted(overlap_start)
+            eth_df1_filtered = eth_df1.iloc[:cut]
             
-            print(f"📊 ETH early (filtered): {len(eth_df1_filtered)} points ending before {overlap_start}")
-            print(f"📊 ETH later: {len(eth_df2)} points")
+            lines.append(f"📊 ETH early (filtered): {len(eth_df1_filtered)} points ending before {overlap_start}")
+            lines.append(f"📊 ETH later: {len(eth_df2)} points")
             
-            # Combine Ethereum data
-            eth_combined = pd.concat([eth_df1_filtered, eth_df2], ignore_index=True)
-            eth_combined = eth_combined.sort_values('timestamp')
+            # Combine Ethereum data (both parts are timestamp-sorted and the early part ends
+            # before the later one starts, so this is normally a no-op ordering check)
+            eth_combined = _cmc_io.sort_by_timestamp(
+                pd.concat([eth_df1_filtered, eth_df2], ignore_index=True))
             
-            print(f"✅ Combined Ethereum data: {len(eth_combined)} points from {eth_combined['timestamp'].min()} to {eth_combined['timestamp'].max()}")
+            lines.append(f"✅ Combined Ethereum data: {len(eth_combined)} points from {eth_combined['timestamp'].min()} to {eth_combined['timestamp'].max()}")
             
-            # Create month-end periods for alignment
-            btc_df['month'] = btc_df['timestamp'].dt.to_period('M')
-            eth_combined['month'] = eth_combined['timestamp'].dt.to_period('M')
+            # Group by month-end bins and take the last (latest) entry per month.
+            # The raw timestamp is kept as a column so BTC timestamps stay the index reference.
+            lines.append("\n🔄 Processing monthly data alignment...")
+            monthly_cols = ['timestamp', 'close', 'marketCap', 'volume']
+            btc_monthly = (btc_df.set_index('timestamp', drop=False)[monthly_cols]
+                           .resample('ME').last().dropna(subset=['timestamp']))
+            eth_monthly = (eth_combined.set_index('timestamp', drop=False)[monthly_cols]
+                           .resample('ME').last().dropna(subset=['timestamp']))
             
-            # Group by month and take the last (latest) entry per month
-            print("\n🔄 Processing monthly data alignment...")
-            btc_monthly = btc_df.groupby('month').last().reset_index()
-            eth_monthly = eth_combined.groupby('month').last().reset_index()
+            lines.append(f"📊 BTC monthly data: {len(btc_monthly)} months")
+            lines.append(f"📊 ETH monthly data: {len(eth_monthly)} months")
             
-            print(f"📊 BTC monthly data: {len(btc_monthly)} months")
-            print(f"📊 ETH monthly data: {len(eth_monthly)} months")
+            # Align on common months
+            aligned = btc_monthly.join(eth_monthly, how='inner', lsuffix='_btc', rsuffix='_eth')
             
-            # Find common months for alignment
-            btc_months = set(btc_monthly['month'])
-            eth_months = set(eth_monthly['month'])
-            common_months = btc_months.intersection(eth_months)
+            lines.append(f"📅 Common months found: {len(aligned)}")
             
-            print(f"📅 Common months found: {len(common_months)}")
-            
-            if len(common_months) == 0:
-                print("❌ No common time periods found")
+            if len(aligned) == 0:
+                lines.append("❌ No common time periods found")
                 return None
             
-            # Filter to common months and sort
-            btc_common = btc_monthly[btc_monthly['month'].isin(common_months)].copy()
-            eth_common = eth_monthly[eth_monthly['month'].isin(common_months)].copy()
-            
-            btc_common = btc_common.sort_values('month')
-            eth_common = eth_common.sort_values('month')
-            
             # Create aligned dataset
             combined_df = pd.DataFrame({
-                'month': btc_common['month'].values,
-                'timestamp': btc_common['timestamp'].values,
-                'btc_price': btc_common['close'].values,
-                'eth_price': eth_common['close'].values,
-                'btc_market_cap': btc_common['marketCap'].values,
-                'eth_market_cap': eth_common['marketCap'].values,
-                'btc_volume': btc_common['volume'].values,
-                'eth_volume': eth_common['volume'].values
+                'month': aligned.index.to_period('M'),
+                'timestamp': aligned['timestamp_btc'].values,
+                'btc_price': aligned['close_btc'].values,
+                'eth_price': aligned['close_eth'].values,
+                'btc_market_cap': aligned['marketCap_btc'].values,
+                'eth_market_cap': aligned['marketCap_eth'].values,
+                'btc_volume': aligned['volume_btc'].values,
+                'eth_volume': aligned['volume_eth'].values
             })
             
             # Set timestamp as index
             combined_df.set_index('timestamp', inplace=True)
             
-            # Calculate ratios
-            combined_df['eth_btc_price_ratio'] = combined_df['eth_price'] / combined_df['btc_price']
-            combined_df['eth_btc_market_cap_ratio'] = combined_df['eth_market_cap'] / combined_df['btc_market_cap']
-            combined_df['btc_eth_market_cap_ratio'] = combined_df['btc_market_cap'] / combined_df['eth_market_cap']
+            # Calculate ratios on the raw arrays; BTC/ETH is the reciprocal of ETH/BTC
+            eth_p = combined_df['eth_price'].to_numpy()
+            btc_p = combined_df['btc_price'].to_numpy()
+            eth_m = combined_df['eth_market_cap'].to_numpy()
+            btc_m = combined_df['btc_market_cap'].to_numpy()
+            market_cap_ratio = eth_m / btc_m
+            combined_df['eth_btc_price_ratio'] = eth_p / btc_p
+            combined_df['eth_btc_market_cap_ratio'] = market_cap_ratio
+            combined_df['btc_eth_market_cap_ratio'] = np.reciprocal(market_cap_ratio)
             
-            print(f"✅ Final aligned dataset: {len(combined_df)} data points")
-            print(f"📅 Complete analysis period: {combined_df.index[0].strftime('%Y-%m-%d')} to {combined_df.index[-1].strftime('%Y-%m-%d')}")
-            print(f"⏱️  Total coverage: {(combined_df.index[-1] - combined_df.index[0]).days / 365.25:.1f} years")
+            # Chart-only copies in trillions, float32 (ratios above keep full float64 precision)
+            combined_df['btc_market_cap_T'] = (btc_m * 1e-12).astype(np.float32)
+            combined_df['eth_market_cap_T'] = (eth_m * 1e-12).astype(np.float32)
+            
+            lines.append(f"✅ Final aligned dataset: {len(combined_df)} data points")
+            lines.append(f"📅 Complete analysis period: {combined_df.index[0].strftime('%Y-%m-%d')} to {combined_df.index[-1].strftime('%Y-%m-%d')}")
+            lines.append(f"⏱️  Total coverage: {(combined_df.index[-1] - combined_df.index[0]).days / 365.25:.1f} years")
             
             return combined_df
             
         except Exception as e:
-            print(f"❌ Error processing data: {e}")
+            lines.append(f"❌ Error processing data: {e}")
+            emit(lines)
             import traceback
             traceback.print_exc()
             return None
+        
+        finally:
+            emit(lines)
     
     def analyze_complete_trends(self, df):
         """
         Analyze complete market cap trends from 2021-2025
         """
-        print("\n📊 COMPLETE MARKET CAP ANALYSIS (2021-2025)")
-        print("=" * 70)
+        lines = ["\n📊 COMPLETE MARKET CAP ANALYSIS (2021-2025)"]
+        lines.append("=" * 70)
         
-        # Current values
-        current_eth_btc_ratio = df['eth_btc_market_cap_ratio'].iloc[-1]
-        current_btc_mc = df['btc_market_cap'].iloc[-1]
-        current_eth_mc = df['eth_market_cap'].iloc[-1]
-        current_price_ratio = df['eth_btc_price_ratio'].iloc[-1]
+        # Current ratio and historical statistics in one fused pass
+        ratio_values = df['eth_btc_market_cap_ratio'].to_numpy(dtype=np.float64)
+        current_eth_btc_ratio, max_ratio, min_ratio, avg_ratio, max_idx, min_idx = summarize_ratio(ratio_values)
+        max_date = df.index[max_idx]
+        min_date = df.index[min_idx]
         
-        # Historical statistics
-        max_ratio = df['eth_btc_market_cap_ratio'].max()
-        min_ratio = df['eth_btc_market_cap_ratio'].min()
-        avg_ratio = df['eth_btc_market_cap_ratio'].mean()
+        # Latest and starting rows, extracted once
+        last = df.iloc[-1]
+        first = df.iloc[0]
         
-        max_date = df['eth_btc_market_cap_ratio'].idxmax()
-        min_date = df['eth_btc_market_cap_ratio'].idxmin()
+        # Current values
+        current_btc_mc = last['btc_market_cap']
+        current_eth_mc = last['eth_market_cap']
+        current_price_ratio = last['eth_btc_price_ratio']
         
         # Starting values (2021)
-        start_eth_btc_ratio = df['eth_btc_market_cap_ratio'].iloc[0]
-        start_btc_mc = df['btc_market_cap'].iloc[0]
-        start_eth_mc = df['eth_market_cap'].iloc[0]
-        
-        print(f"💰 Current Market Data (Latest):")
-        print(f"   BTC Market Cap: ${current_btc_mc/1e12:.2f}T")
-        print(f"   ETH Market Cap: ${current_eth_mc/1e12:.2f}T")
-        print(f"   BTC Price: ${df['btc_price'].iloc[-1]:,.0f}")
-        print(f"   ETH Price: ${df['eth_price'].iloc[-1]:,.0f}")
-        
-        print(f"\n📈 Market Cap Ratios:")
-        print(f"   Current ETH/BTC Ratio: {current_eth_btc_ratio:.4f}")
-        print(f"   Starting (2021) Ratio: {start_eth_btc_ratio:.4f}")
-        print(f"   Change since 2021: {((current_eth_btc_ratio/start_eth_btc_ratio)-1)*100:+.1f}%")
-        
-        print(f"\n🔄 Market Growth since 2021:")
+        start_eth_btc_ratio = first['eth_btc_market_cap_ratio']
+        start_btc_mc = first['btc_market_cap']
+        start_eth_mc = first['eth_market_cap']
+        
+        lines.append(f"💰 Current Market Data (Latest):")
+        lines.append(f"   BTC Market Cap: ${current_btc_mc/1e12:.2f}T")
+        lines.append(f"   ETH Market Cap: ${current_eth_mc/1e12:.2f}T")
+        lines.append(f"   BTC Price: ${last['btc_price']:,.0f}")
+        lines.append(f"   ETH Price: ${last['eth_price']:,.0f}")
+        
+        lines.append(f"\n📈 Market Cap Ratios:")
+        lines.append(f"   Current ETH/BTC Ratio: {current_eth_btc_ratio:.4f}")
+        lines.append(f"   Starting (2021) Ratio: {start_eth_btc_ratio:.4f}")
+        lines.append(f"   Change since 2021: {((current_eth_btc_ratio/start_eth_btc_ratio)-1)*100:+.1f}%")
+        
+        lines.append(f"\n🔄 Market Growth since 2021:")
         btc_growth = ((current_btc_mc / start_btc_mc) - 1) * 100
         eth_growth = ((current_eth_mc / start_eth_mc) - 1) * 100
-        print(f"   BTC Market Cap: {btc_growth:+.1f}%")
-        print(f"   ETH Market Cap: {eth_growth:+.1f}%")
-        print(f"   Relative Performance: ETH {'outperformed' if eth_growth > btc_growth else 'underperformed'} by {abs(eth_growth - btc_growth):.1f}%")
+        lines.append(f"   BTC Market Cap: {btc_growth:+.1f}%")
+        lines.append(f"   ETH Market Cap: {eth_growth:+.1f}%")
+        lines.append(f"   Relative Performance: ETH {'outperformed' if eth_growth > btc_growth else 'underperformed'} by {abs(eth_growth - btc_growth):.1f}%")
         
-        print(f"\n📊 Price vs Market Cap Analysis:")
-        print(f"   ETH/BTC Price Ratio: {current_price_ratio:.6f}")
-        print(f"   ETH/BTC Market Cap Ratio: {current_eth_btc_ratio:.4f}")
+        lines.append(f"\n📊 Price vs Market Cap Analysis:")
+        lines.append(f"   ETH/BTC Price Ratio: {current_price_ratio:.6f}")
+        lines.append(f"   ETH/BTC Market Cap Ratio: {current_eth_btc_ratio:.4f}")
         
         ratio_difference = ((current_eth_btc_ratio / current_price_ratio) - 1) * 100
         if ratio_difference > 0:
-            print(f"   💡 Market cap ratio is {ratio_difference:.1f}% HIGHER than price ratio")
-            print(f"      → ETH has more circulating supply relative to BTC")
+            lines.append(f"   💡 Market cap ratio is {ratio_difference:.1f}% HIGHER than price ratio")
+            lines.append(f"      → ETH has more circulating supply relative to BTC")
         else:
-            print(f"   💡 Price ratio is {abs(ratio_difference):.1f}% HIGHER than market cap ratio")
-            print(f"      → BTC has more circulating supply relative to ETH")
+            lines.append(f"   💡 Price ratio is {abs(ratio_difference):.1f}% HIGHER than market cap ratio")
+            lines.append(f"      → BTC has more circulating supply relative to ETH")
         
-        print(f"\n📈 Historical Range Analysis:")
-        print(f"   4-Year Average: {avg_ratio:.4f}")
-        print(f"   Maximum: {max_ratio:.4f} on {max_date.strftime('%Y-%m-%d')}")
-        print(f"   Minimum: {min_ratio:.4f} on {min_date.strftime('%Y-%m-%d')}")
-        print(f"   Total Volatility: {max_ratio/min_ratio:.2f}x range")
+        lines.append(f"\n📈 Historical Range Analysis:")
+        lines.append(f"   4-Year Average: {avg_ratio:.4f}")
+        lines.append(f"   Maximum: {max_ratio:.4f} on {max_date.strftime('%Y-%m-%d')}")
+        lines.append(f"   Minimum: {min_ratio:.4f} on {min_date.strftime('%Y-%m-%d')}")
+        lines.append(f"   Total Volatility: {max_ratio/min_ratio:.2f}x range")
         
         # Market cycle analysis
         ratio_percentile = (current_eth_btc_ratio - min_ratio) / (max_ratio - min_ratio) * 100
@@ -194,9 +248,10 @@ class CompleteCoinMarketCapAnalyzer:
         else:
             strength = "NEUTRAL ⚖️"
         
-        print(f"\n🔄 Current Market Position:")
-        print(f"   ETH is {strength} vs BTC")
-        print(f"   Current ratio at {ratio_percentile:.1f}% of 4-year range")
+        lines.append(f"\n🔄 Current Market Position:")
+        lines.append(f"   ETH is {strength} vs BTC")
+        lines.append(f"   Current ratio at {ratio_percentile:.1f}% of 4-year range")
+        emit(lines)
         
         return {
             'current_ratio': current_eth_btc_ratio,
@@ -212,9 +267,20 @@ class CompleteCoinMarketCapAnalyzer:
             'eth_growth': eth_growth
         }
     
-    def create_complete_chart(self, df, stats):
+    def add_reference_lines(self, ax, levels, colors, linestyles, linewidths):
+        """
+        Draw full-width horizontal reference lines on one axis as a single LineCollection
+        (x in axes coordinates, y in data coordinates, like axhline)
+        """
+        segments = [[(0, level), (1, level)] for level in levels]
+        ax.add_collection(LineCollection(segments, colors=colors, linestyles=linestyles,
+                                         linewidths=linewidths, transform=ax.get_yaxis_transform()),
+                          autolim=False)
+    
+    def create_complete_chart(self, df, stats, dpi=150):
         """
         Create comprehensive chart showing the complete 2021-2025 analysis
+        dpi: output resolution (render cost grows quadratically; use 300 for print quality)
         """
         print(f"\n📊 Creating complete 2021-2025 analysis chart...")
         
@@ -226,7 +292,8 @@ class CompleteCoinMarketCapAnalyzer:
         
         # Chart 1: ETH/BTC Price Ratio
         ax1.plot(df.index, df['eth_btc_price_ratio'], 
-                color='purple', linewidth=2.5, marker='o', markersize=3, alpha=0.8, label='ETH/BTC Price Ratio')
+                color='purple', linewidth=2.5, marker='o', markersize=3, alpha=0.8, label='ETH/BTC Price Ratio',
+                rasterized=True)
         ax1.set_title('ETH/BTC Price Ratio (2021-2025)', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Price Ratio', fontsize=12)
         ax1.grid(True, alpha=0.3)
@@ -234,8 +301,9 @@ class CompleteCoinMarketCapAnalyzer:
         
         # Add reference lines
         avg_price_ratio = df['eth_btc_price_ratio'].mean()
-        ax1.axhline(y=avg_price_ratio, color='gray', linestyle=':', alpha=0.7)
-        ax1.axhline(y=stats['current_price_ratio'], color='red', linestyle='--', alpha=0.7)
+        self.add_reference_lines(ax1, [avg_price_ratio, stats['current_price_ratio']],
+                                 colors=[to_rgba('gray', 0.7), to_rgba('red', 0.7)],
+                                 linestyles=[':', '--'], linewidths=[1.5, 1.5])
         ax1.text(0.02, 0.98, f'Current: {stats["current_price_ratio"]:.6f}', 
                 transform=ax1.transAxes, verticalalignment='top',
                 bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7))
@@ -244,9 +312,11 @@ class CompleteCoinMarketCapAnalyzer:
         ax2_twin = ax2.twinx()
         
         line1 = ax2.plot(df.index, df['btc_price'], 
-                        color='orange', linewidth=2.5, marker='o', markersize=3, alpha=0.8, label='BTC Price (USD)')
+                        color='orange', linewidth=2.5, marker='o', markersize=3, alpha=0.8, label='BTC Price (USD)',
+                        rasterized=True)
         line2 = ax2_twin.plot(df.index, df['eth_price'], 
-                             color='blue', linewidth=2.5, marker='s', markersize=3, alpha=0.8, label='ETH Price (USD)')
+                             color='blue', linewidth=2.5, marker='s', markersize=3, alpha=0.8, label='ETH Price (USD)',
+                             rasterized=True)
         
         ax2.set_title('BTC and ETH USD Prices (2021-2025)', fontsize=14, fontweight='bold')
         ax2.set_ylabel('BTC Price (USD)', fontsize=12, color='orange')
@@ -266,18 +336,21 @@ class CompleteCoinMarketCapAnalyzer:
         ax3_twin2.spines['right'].set_position(('outward', 60))
         
         # Market caps with filled areas
-        line1 = ax3.plot(df.index, df['btc_market_cap'] / 1e12, 
-                        color='orange', linewidth=3, marker='o', markersize=4, label='BTC Market Cap (T USD)')
-        ax3.fill_between(df.index, 0, df['btc_market_cap'] / 1e12, color='orange', alpha=0.1)
+        line1 = ax3.plot(df.index, df['btc_market_cap_T'], 
+                        color='orange', linewidth=3, marker='o', markersize=4, label='BTC Market Cap (T USD)',
+                        rasterized=True)
+        ax3.fill_between(df.index, 0, df['btc_market_cap_T'], color='orange', alpha=0.1, rasterized=True)
         
-        line2 = ax3_twin1.plot(df.index, df['eth_market_cap'] / 1e12,
-                              color='blue', linewidth=3, marker='s', markersize=4, label='ETH Market Cap (T USD)')
-        ax3_twin1.fill_between(df.index, 0, df['eth_market_cap'] / 1e12, color='blue', alpha=0.1)
+        line2 = ax3_twin1.plot(df.index, df['eth_market_cap_T'],
+                              color='blue', linewidth=3, marker='s', markersize=4, label='ETH Market Cap (T USD)',
+                              rasterized=True)
+        ax3_twin1.fill_between(df.index, 0, df['eth_market_cap_T'], color='blue', alpha=0.1, rasterized=True)
         
         # ETH/BTC market cap ratio overlay (THE KEY INSIGHT!)
         line3 = ax3_twin2.plot(df.index, df['eth_btc_market_cap_ratio'],
                               color='purple', linewidth=4, alpha=0.9, linestyle='--', 
-                              marker='D', markersize=5, label='ETH/BTC Market Cap Ratio')
+                              marker='D', markersize=5, label='ETH/BTC Market Cap Ratio',
+                              rasterized=True)
         
         ax3.set_title('Market Caps with ETH/BTC Ratio Overlay (2021-2025)', fontsize=14, fontweight='bold')
         ax3.set_ylabel('BTC Market Cap (T USD)', fontsize=12, color='orange')
@@ -291,9 +364,9 @@ class CompleteCoinMarketCapAnalyzer:
         
         # Add ratio reference lines
         avg_ratio = stats['avg_ratio']
-        ax3_twin2.axhline(y=avg_ratio, color='gray', linestyle=':', alpha=0.8, linewidth=2)
-        ax3_twin2.axhline(y=stats['current_ratio'], color='red', linestyle='-', alpha=0.8, linewidth=2)
-        ax3_twin2.axhline(y=stats['start_ratio'], color='green', linestyle='-', alpha=0.6, linewidth=2)
+        self.add_reference_lines(ax3_twin2, [avg_ratio, stats['current_ratio'], stats['start_ratio']],
+                                 colors=[to_rgba('gray', 0.8), to_rgba('red', 0.8), to_rgba('green', 0.6)],
+                                 linestyles=[':', '-', '-'], linewidths=[2, 2, 2])
         
         # Combine all legends
         lines = line1 + line2 + line3
@@ -327,8 +400,8 @@ Period: {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')
 Coverage: {years_span:.1f} years, {len(df)} months
 
 Current Market Caps:
-  BTC: ${df['btc_market_cap'].iloc[-1]/1e12:.2f}T (Growth: {stats['btc_growth']:+.1f}%)
-  ETH: ${df['eth_market_cap'].iloc[-1]/1e12:.2f}T (Growth: {stats['eth_growth']:+.1f}%)
+  BTC: ${df['btc_market_cap_T'].iloc[-1]:.2f}T (Growth: {stats['btc_growth']:+.1f}%)
+  ETH: ${df['eth_market_cap_T'].iloc[-1]:.2f}T (Growth: {stats['eth_growth']:+.1f}%)
 
 ETH/BTC Market Cap Ratios:
   Current: {stats['current_ratio']:.4f}
@@ -356,7 +429,7 @@ Key Insight:
         # Save chart
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"eth_btc_complete_2021_2025_analysis_{timestamp}.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        plt.savefig(filename, dpi=dpi, bbox_inches='tight')
         print(f"📊 Complete analysis chart saved as: {filename}")
         
         plt.show()
@@ -3,8 +3,8 @@
 Debug script to examine CoinMarketCap CSV data structure
 """
 
-import pandas as pd
 from datetime import datetime
+import _cmc_io
 
 def debug_csv_files():
     """
@@ -15,27 +15,23 @@ def debug_csv_files():
     
     # Load Bitcoin data
     print("\n📊 Bitcoin Data Analysis:")
-    btc_df = pd.read_csv("Bitcoin_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv", delimiter=';')
+    btc_df = _cmc_io.parse("Bitcoin_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv")
     print(f"Columns: {list(btc_df.columns)}")
     print(f"Shape: {btc_df.shape}")
     print(f"Sample data:")
     print(btc_df.head(3))
     
-    # Process timestamps
-    btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'].str.strip('"'))
     print(f"Date range: {btc_df['timestamp'].min()} to {btc_df['timestamp'].max()}")
     print(f"Sorted dates (first 5): {btc_df['timestamp'].sort_values().head().tolist()}")
     
     # Load Ethereum data
     print("\n📊 Ethereum Data Analysis:")
-    eth_df = pd.read_csv("Ethereum_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv", delimiter=';')
+    eth_df = _cmc_io.parse("Ethereum_2021_7_1-2025_7_28_historical_data_coinmarketcap.csv")
     print(f"Columns: {list(eth_df.columns)}")
     print(f"Shape: {eth_df.shape}")
     print(f"Sample data:")
     print(eth_df.head(3))
     
-    # Process timestamps
-    eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'].str.strip('"'))
     print(f"Date range: {eth_df['timestamp'].min()} to {eth_df['timestamp'].max()}")
     print(f"Sorted dates (first 5): {eth_df['timestamp'].sort_values().head().tolist()}")
     
@@ -11,6 +11,14 @@ import time
 from datetime import datetime, timedelta
 import os
 
+# pyarrow's CSV writer is used when available, otherwise pandas' writer
+PYARROW_AVAILABLE = True
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 class HistoricalDataDownloader:
     def __init__(self):
         self.base_dir = "historical_data"
@@ -48,14 +56,12 @@ class HistoricalDataDownloader:
             
             # BTC-USD
             btc = yf.download("BTC-USD", start=start_date, end=end_date, interval="1d")
-            btc_file = os.path.join(self.base_dir, "btc_yahoo_finance.csv")
-            btc.to_csv(btc_file)
+            btc_file = self.save_yahoo_finance(btc, "btc")
             print(f"✅ BTC data saved to: {btc_file}")
             
             # ETH-USD  
             eth = yf.download("ETH-USD", start=start_date, end=end_date, interval="1d")
-            eth_file = os.path.join(self.base_dir, "eth_yahoo_finance.csv")
-            eth.to_csv(eth_file)
+            eth_file = self.save_yahoo_finance(eth, "eth")
             print(f"✅ ETH data saved to: {eth_file}")
             
             return True
@@ -67,6 +73,39 @@ class HistoricalDataDownloader:
             print(f"❌ Error downloading from Yahoo Finance: {e}")
             return False
 
+    def save_yahoo_finance(self, df, coin):
+        """
+        Save a Yahoo Finance download as zstd Parquet (typed, compact), or CSV without pyarrow
+        """
+        if not PYARROW_AVAILABLE:
+            filename = os.path.join(self.base_dir, f"{coin}_yahoo_finance.csv")
+            df.to_csv(filename)
+            return filename
+        
+        # Single-ticker downloads carry a (Price, Ticker) column MultiIndex; keep the price level
+        if isinstance(df.columns, pd.MultiIndex):
+            df = df.copy()
+            df.columns = df.columns.get_level_values(0)
+        
+        filename = os.path.join(self.base_dir, f"{coin}_yahoo_finance.parquet")
+        df.to_parquet(filename, engine='pyarrow', compression='zstd')
+        return filename
+    
+    def read_yahoo_finance(self, coin):
+        """
+        Load a saved Yahoo Finance download, preferring the Parquet file
+        """
+        parquet_file = os.path.join(self.base_dir, f"{coin}_yahoo_finance.parquet")
+        if PYARROW_AVAILABLE and os.path.exists(parquet_file):
+            return pd.read_parquet(parquet_file, engine='pyarrow')
+        
+        csv_file = os.path.join(self.base_dir, f"{coin}_yahoo_finance.csv")
+        if os.path.exists(csv_file):
+            # yfinance CSVs have two extra header rows (Ticker, Date) under the column names
+            return pd.read_csv(csv_file, header=0, skiprows=[1, 2], index_col=0, parse_dates=True)
+        
+        return None
+    
     def create_mock_historical_data(self):
         """
         Create extended mock data for demonstration (2021-present)
@@ -79,20 +118,24 @@ class HistoricalDataDownloader:
         dates = pd.date_range(start_date, end_date, freq='D')
         
         # Create realistic-looking market cap data with trends
-        np.random.seed(42)  # For reproducible results
+        rng = np.random.default_rng(42)  # For reproducible results
         
         # BTC market cap progression (started ~600B in 2021, now ~2.4T)
         btc_mc_start = 600e9  # $600B
         btc_mc_end = 2.4e12   # $2.4T
         btc_trend = np.linspace(btc_mc_start, btc_mc_end, len(dates))
-        btc_noise = np.random.normal(0, 0.1, len(dates))
+        btc_noise = np.empty(len(dates))
+        rng.standard_normal(out=btc_noise)
+        btc_noise *= 0.1
         btc_market_cap = btc_trend * (1 + btc_noise)
         
         # ETH market cap progression (started ~150B in 2021, now ~470B)  
         eth_mc_start = 150e9  # $150B
         eth_mc_end = 470e9    # $470B
         eth_trend = np.linspace(eth_mc_start, eth_mc_end, len(dates))
-        eth_noise = np.random.normal(0, 0.15, len(dates))  # More volatile
+        eth_noise = np.empty(len(dates))
+        rng.standard_normal(out=eth_noise)
+        eth_noise *= 0.15  # More volatile
         eth_market_cap = eth_trend * (1 + eth_noise)
         
         # Add some major events/cycles
@@ -101,24 +144,27 @@ class HistoricalDataDownloader:
         bear_bottom = datetime(2022, 11, 1)
         recovery_start = datetime(2024, 1, 1)
         
-        for i, date in enumerate(dates):
-            # 2021 bull run
-            if date <= bull_peak:
-                multiplier = 1.5 + 0.5 * np.sin((date - start_date).days / 100)
-                btc_market_cap[i] *= multiplier
-                eth_market_cap[i] *= multiplier * 1.2  # ETH outperformed
-                
-            # 2022 bear market
-            elif date <= bear_bottom:
-                multiplier = 0.5 + 0.3 * np.cos((date - bull_peak).days / 50)
-                btc_market_cap[i] *= multiplier
-                eth_market_cap[i] *= multiplier * 0.8  # ETH fell more
-                
-            # 2024 recovery
-            elif date >= recovery_start:
-                multiplier = 1.2 + 0.4 * np.sin((date - recovery_start).days / 80)
-                btc_market_cap[i] *= multiplier
-                eth_market_cap[i] *= multiplier * 1.1
+        # Vectorized regime masks (same precedence as the bull -> bear -> recovery chain)
+        days = (dates - start_date).days.to_numpy()
+        bull_mask = dates <= bull_peak
+        bear_mask = ~bull_mask & (dates <= bear_bottom)
+        recovery_mask = ~bull_mask & ~bear_mask & (dates >= recovery_start)
+        
+        bull_peak_days = (bull_peak - start_date).days
+        recovery_days = (recovery_start - start_date).days
+        
+        multiplier = np.select(
+            [bull_mask, bear_mask, recovery_mask],
+            [1.5 + 0.5 * np.sin(days / 100),                     # 2021 bull run
+             0.5 + 0.3 * np.cos((days - bull_peak_days) / 50),   # 2022 bear market
+             1.2 + 0.4 * np.sin((days - recovery_days) / 80)],   # 2024 recovery
+            default=1.0
+        )
+        # ETH outperformed in the bull run, fell more in the bear market
+        eth_factor = np.select([bull_mask, bear_mask, recovery_mask], [1.2, 0.8, 1.1], default=1.0)
+        
+        btc_market_cap *= multiplier
+        eth_market_cap *= multiplier * eth_factor
         
         # Calculate ratios
         eth_btc_ratio = eth_market_cap / btc_market_cap
@@ -134,7 +180,10 @@ class HistoricalDataDownloader:
         
         # Save to CSV
         filename = os.path.join(self.base_dir, "extended_market_cap_data_2021_present.csv")
-        historical_df.to_csv(filename, index=False)
+        if PYARROW_AVAILABLE:
+            pacsv.write_csv(pa.Table.from_pandas(historical_df, preserve_index=False), filename)
+        else:
+            historical_df.to_csv(filename, index=False)
         
         print(f"✅ Extended historical data created: {filename}")
         print(f"📊 Data range: {dates[0].strftime('%Y-%m-%d')} to {dates[-1].strftime('%Y-%m-%d')}")
@@ -5,18 +5,322 @@ Advanced volume analysis toolkit for trading strategy development
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import ccxt
-import time
+import ccxt.async_support as ccxt_async
+import asyncio
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 import warnings
+from _cache import FileCache
 warnings.filterwarnings('ignore')
 
-def fetch_crypto_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=500, exchange='binance'):
+# Numba is optional; without it the kernels below run as plain Python
+NUMBA_AVAILABLE = True
+try:
+    from numba import njit
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# PyArrow is optional; it only speeds up CSV parsing
+PYARROW_AVAILABLE = True
+try:
+    import pyarrow
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def cluster_levels(prices, tolerance):
+    """
+    Label price levels so that each cluster holds every level within `tolerance` (relative) above its lowest price.
+    Labels are numbered in ascending price order.
+    """
+    order = np.argsort(prices, kind='mergesort')
+    labels = np.empty(len(prices), dtype=np.int64)
+    
+    label = -1
+    anchor = 0.0
+    for k in range(len(order)):
+        price = prices[order[k]]
+        if label < 0 or abs(price - anchor) / anchor >= tolerance:
+            label += 1
+            anchor = price
+        labels[order[k]] = label
+    
+    return labels
+
+
+def rolling_mean(values, window):
+    """
+    Trailing mean over `window` values, NaN until the window is full or while it holds a NaN.
+    Keeps a compensated running sum (add the new value, drop the oldest) so each bar is O(1).
+    Matches Series.rolling(window).mean().
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    total = 0.0
+    compensation = 0.0
+    nan_count = 0
+    for i in range(n):
+        value = values[i]
+        if value != value:
+            nan_count += 1
+        else:
+            y = value - compensation
+            t = total + y
+            compensation = (t - total) - y
+            total = t
+        
+        if i >= window:
+            old = values[i - window]
+            if old != old:
+                nan_count -= 1
+            else:
+                y = -old - compensation
+                t = total + y
+                compensation = (t - total) - y
+                total = t
+        
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+    return out
+
+
+def rolling_mean_pandas(values, window):
+    """
+    pandas version of rolling_mean for installs without numba.
+    """
+    return pd.Series(values).rolling(window).mean().to_numpy()
+
+
+def cluster_levels_sweep(prices, tolerance):
+    """
+    NumPy version of cluster_levels for installs without numba.
+    Jumps from one cluster anchor to the next with a vectorized scan, so the Python loop runs once per cluster.
+    """
+    order = np.argsort(prices, kind='mergesort')
+    sorted_prices = prices[order]
+    sorted_labels = np.empty(len(prices), dtype=np.int64)
+    
+    label = 0
+    start = 0
+    while start < len(sorted_prices):
+        anchor = sorted_prices[start]
+        # Relative distance grows with price, so the first level past the tolerance ends the cluster
+        outside = np.abs(sorted_prices[start + 1:] - anchor) / anchor >= tolerance
+        stop = start + 1 + (np.argmax(outside) if outside.any() else len(outside))
+        sorted_labels[start:stop] = label
+        label += 1
+        start = stop
+    
+    labels = np.empty_like(sorted_labels)
+    labels[order] = sorted_labels
+    return labels
+
+
+def smoothed_change(values, periods, window):
+    """
+    `periods`-bar percentage change averaged over the trailing `window` bars.
+    Same result as Series.pct_change(periods).rolling(window).mean(), via a zero-copy window view.
+    """
+    change = np.full(len(values), np.nan)
+    change[periods:] = values[periods:] / values[:-periods] - 1
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(change, window).mean(axis=-1)
+    return out
+
+
+# Per-bar flag bits packed into the `bar_flags` uint8 column
+FLAG_INSTITUTIONAL = 1    # volume above the institutional threshold
+FLAG_VOLUME_WAVE = 2      # volume above 1.5x its 20-bar average
+FLAG_VOLUME_ANOMALY = 4   # volume above 4x its 20-bar average
+FLAG_BUYING = 8           # close above open
+FLAG_SELLING = 16         # close below open
+
+# Trade record codes written by run_backtest
+TRADE_TYPES = ('long_entry', 'short_entry', 'long_exit', 'short_exit')
+
+
+def run_backtest(price, target_position, exit_signal, stop_loss, take_profit):
+    """
+    Bar-by-bar position state machine with stop loss, take profit and signal exits.
+    Returns the held position and entry price per bar plus flat trade records
+    (entry price, exit price, size, return, TRADE_TYPES code); entries carry NaN exit price and return.
+    """
+    n = len(price)
+    position = np.zeros(n)
+    entry_prices = np.zeros(n)
+    
+    # At most one exit and one entry per bar
+    trade_entry = np.empty(2 * n)
+    trade_exit = np.empty(2 * n)
+    trade_size = np.empty(2 * n)
+    trade_return = np.empty(2 * n)
+    trade_type = np.empty(2 * n, dtype=np.int64)
+    n_trades = 0
+    
+    current_position = 0.0
+    entry_price = 0.0
+    
+    for i in range(1, n):
+        current_price = price[i]
+        target_pos = target_position[i]
+        
+        # Exit conditions (stop loss, take profit, exit signal or reversal)
+        if current_position != 0:
+            price_change = (current_price - entry_price) / entry_price
+            
+            if current_position > 0:
+                close_trade = (price_change <= -stop_loss or price_change >= take_profit or
+                               exit_signal[i] or target_pos < 0)
+                code = 2
+                result = current_position * price_change
+            else:
+                close_trade = (price_change >= stop_loss or price_change <= -take_profit or
+                               exit_signal[i] or target_pos > 0)
+                code = 3
+                result = -current_position * price_change  # Negative because short
+            
+            if close_trade:
+                trade_entry[n_trades] = entry_price
+                trade_exit[n_trades] = current_price
+                trade_size[n_trades] = current_position
+                trade_return[n_trades] = result
+                trade_type[n_trades] = code
+                n_trades += 1
+                current_position = 0.0
+                entry_price = 0.0
+        
+        # Entry conditions (only if no current position)
+        if current_position == 0 and abs(target_pos) > 0.01:  # Minimum threshold
+            current_position = target_pos
+            entry_price = current_price
+            trade_entry[n_trades] = entry_price
+            trade_exit[n_trades] = np.nan
+            trade_size[n_trades] = current_position
+            trade_return[n_trades] = np.nan
+            trade_type[n_trades] = 0 if current_position > 0 else 1
+            n_trades += 1
+        
+        position[i] = current_position
+        entry_prices[i] = entry_price if current_position != 0 else 0.0
+    
+    return (position, entry_prices, trade_entry[:n_trades], trade_exit[:n_trades],
+            trade_size[:n_trades], trade_return[:n_trades], trade_type[:n_trades])
+
+
+def equity_curve(position, returns):
+    """
+    Strategy returns (position held over the previous bar * market return), their
+    compounded equity curve, its maximum drawdown and the mean and sample variance
+    (ddof=1, NaN skipped) of the strategy returns, in a single pass.
+    """
+    n = len(position)
+    strategy_returns = np.zeros(n)
+    cumulative_returns = np.ones(n)
+    
+    cum = 1.0
+    peak = 1.0
+    max_drawdown = 0.0
+    # Welford running moments, seeded with the flat first bar
+    count = 1 if n > 0 else 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, n):
+        if position[i - 1] != 0:
+            strategy_returns[i] = position[i - 1] * returns[i]
+        r = strategy_returns[i]
+        if r == r:
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+        cum *= 1.0 + r
+        cumulative_returns[i] = cum
+        # NaN comparisons are False, so test for it explicitly to propagate it like cumprod/cummax
+        if cum > peak or cum != cum:
+            peak = cum
+        drawdown = cum / peak - 1.0
+        if drawdown < max_drawdown or drawdown != drawdown:
+            max_drawdown = drawdown
+    
+    variance = m2 / (count - 1) if count > 1 else np.nan
+    if count == 0:
+        mean = np.nan
+    return strategy_returns, cumulative_returns, max_drawdown, mean, variance
+
+
+if NUMBA_AVAILABLE:
+    cluster_levels = njit(cache=True)(cluster_levels)
+    rolling_mean = njit(cache=True)(rolling_mean)
+    run_backtest = njit(cache=True)(run_backtest)
+    equity_curve = njit(cache=True)(equity_curve)
+else:
+    cluster_levels = cluster_levels_sweep
+    rolling_mean = rolling_mean_pandas
+
+@lru_cache(maxsize=8)
+def get_exchange(exchange):
+    """
+    Shared CCXT client per exchange name.
+    Reusing it keeps the HTTP session, loaded markets and rate limiter across calls.
+    """
+    exchange_class = getattr(ccxt, exchange)
+    return exchange_class({
+        'apiKey': '',  # Add your API key if needed
+        'secret': '',  # Add your secret if needed
+        'timeout': 30000,
+        'enableRateLimit': True,
+    })
+
+# On-disk cache of OHLCV downloads for repeated test runs and strategy sweeps.
+# Opt-in (use_cache=True): cached candles can be up to one period old, including a frozen open candle.
+_ohlcv_cache = FileCache()
+
+def _ohlcv_cache_params(exchange, symbol, timeframe, limit):
+    return {'exchange': exchange, 'symbol': symbol, 'timeframe': timeframe, 'limit': limit}
+
+def get_cached_ohlcv(exchange, symbol, timeframe, limit):
+    """Cached OHLCV rows for the request, or None if missing or older than one candle period"""
+    return _ohlcv_cache.get('ccxt/ohlcv', _ohlcv_cache_params(exchange, symbol, timeframe, limit),
+                            ccxt.Exchange.parse_timeframe(timeframe))
+
+def cache_ohlcv(exchange, symbol, timeframe, limit, ohlcv):
+    """Store OHLCV rows fetched outside fetch_ohlcv_cached (e.g. by an async client)"""
+    _ohlcv_cache.set('ccxt/ohlcv', _ohlcv_cache_params(exchange, symbol, timeframe, limit), ohlcv)
+
+def fetch_ohlcv_cached(exchange, symbol, timeframe, limit):
+    """
+    OHLCV rows from the file cache, refreshed once they are older than one candle period.
+    Fetch errors propagate so callers can fall back to another exchange.
+    """
+    return _ohlcv_cache.get_or_fetch('ccxt/ohlcv', _ohlcv_cache_params(exchange, symbol, timeframe, limit),
+                                     ccxt.Exchange.parse_timeframe(timeframe),
+                                     lambda: get_exchange(exchange).fetch_ohlcv(symbol, timeframe, limit=limit))
+
+def ohlcv_to_frame(ohlcv):
+    """CCXT OHLCV rows -> DataFrame indexed by timestamp"""
+    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df
+
+def _fetch_ohlcv(exchange, symbol, timeframe, limit, use_cache):
+    """OHLCV rows straight from the exchange, or through the file cache when use_cache is set"""
+    if use_cache:
+        return fetch_ohlcv_cached(exchange, symbol, timeframe, limit)
+    return get_exchange(exchange).fetch_ohlcv(symbol, timeframe, limit=limit)
+
+def fetch_crypto_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=500, exchange='binance', use_cache=False):
     """
     Fetch cryptocurrency data using CCXT
     
@@ -25,28 +329,18 @@ def fetch_crypto_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=500, exchang
     timeframe (str): Timeframe ('1m', '5m', '15m', '1h', '4h', '1d', '1w')
     limit (int): Number of candles to fetch
     exchange (str): Exchange name ('binance', 'coinbase', 'kraken', etc.)
+    use_cache (bool): Reuse downloads from the on-disk cache for up to one candle period
     
     Returns:
     pd.DataFrame: OHLCV data
     """
     try:
-        # Initialize exchange
-        exchange_class = getattr(ccxt, exchange)
-        exchange_instance = exchange_class({
-            'apiKey': '',  # Add your API key if needed
-            'secret': '',  # Add your secret if needed
-            'timeout': 30000,
-            'enableRateLimit': True,
-        })
-        
         # Fetch OHLCV data
         print(f"Fetching {symbol} data from {exchange}...")
-        ohlcv = exchange_instance.fetch_ohlcv(symbol, timeframe, limit=limit)
+        ohlcv = _fetch_ohlcv(exchange, symbol, timeframe, limit, use_cache)
         
         # Create DataFrame
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        df = ohlcv_to_frame(ohlcv)
         
         print(f"Successfully fetched {len(df)} candles")
         return df
@@ -61,18 +355,10 @@ def fetch_crypto_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=500, exchang
         for alt_exchange in alternative_exchanges:
             if alt_exchange != exchange:
                 try:
-                    alt_exchange_class = getattr(ccxt, alt_exchange)
-                    alt_exchange_instance = alt_exchange_class({
-                        'timeout': 30000,
-                        'enableRateLimit': True,
-                    })
-                    
                     print(f"Trying {alt_exchange}...")
-                    ohlcv = alt_exchange_instance.fetch_ohlcv(symbol, timeframe, limit=limit)
+                    ohlcv = _fetch_ohlcv(alt_exchange, symbol, timeframe, limit, use_cache)
                     
-                    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    df.set_index('timestamp', inplace=True)
+                    df = ohlcv_to_frame(ohlcv)
                     
                     print(f"Successfully fetched {len(df)} candles from {alt_exchange}")
                     return df
@@ -83,6 +369,52 @@ def fetch_crypto_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=500, exchang
         
         raise Exception("Failed to fetch data from all attempted exchanges")
 
+async def _fetch_ohlcv_batch(symbols, timeframe, limit, exchange):
+    """Fetch all symbols concurrently over one async client (its rate limiter spaces the requests)"""
+    client = getattr(ccxt_async, exchange)({
+        'timeout': 30000,
+        'enableRateLimit': True,
+    })
+    try:
+        return await asyncio.gather(
+            *(client.fetch_ohlcv(symbol, timeframe, limit=limit) for symbol in symbols),
+            return_exceptions=True
+        )
+    finally:
+        await client.close()
+
+def fetch_multiple_symbols_ccxt(symbols, timeframe='1d', limit=500, exchange='binance'):
+    """
+    Fetch several symbols concurrently using CCXT's async client
+    
+    Parameters:
+    symbols (list): Trading pair symbols (e.g., ['BTC/USDT', 'ETH/USDT'])
+    timeframe (str): Timeframe
+    limit (int): Number of candles per symbol
+    exchange (str): Exchange name
+    
+    Returns:
+    dict: symbol -> OHLCV DataFrame (symbols that fail on every exchange are left out)
+    """
+    print(f"Fetching {len(symbols)} symbols from {exchange}...")
+    results = asyncio.run(_fetch_ohlcv_batch(symbols, timeframe, limit, exchange))
+    
+    data = {}
+    for symbol, ohlcv in zip(symbols, results):
+        if isinstance(ohlcv, Exception):
+            print(f"Error fetching {symbol} from {exchange}: {ohlcv}")
+            # Fall back to the sequential path, which also tries alternative exchanges
+            try:
+                data[symbol] = fetch_crypto_data_ccxt(symbol, timeframe, limit, exchange)
+            except Exception as e:
+                print(f"Skipping {symbol}: {e}")
+            continue
+        
+        data[symbol] = ohlcv_to_frame(ohlcv)
+    
+    print(f"Successfully fetched {len(data)}/{len(symbols)} symbols")
+    return data
+
 def load_csv_data(file_path, sep=','):
     """
     Load data from CSV file with flexible parsing
@@ -95,22 +427,22 @@ def load_csv_data(file_path, sep=','):
     pd.DataFrame: OHLCV data
     """
     try:
-        # Try different separators
+        # Detect the separator from the first 64KB instead of re-reading the file per candidate
         separators = [sep, ';', ',', '\t']
+        with open(file_path, newline='', encoding='utf-8-sig') as f:
+            sample = f.read(65536)
+        try:
+            separator = csv.Sniffer().sniff(sample, delimiters=''.join(separators)).delimiter
+        except csv.Error:
+            separator = sep
         
-        for separator in separators:
-            try:
-                df = pd.read_csv(file_path, sep=separator)
-                
-                # Check if we have the required columns
-                required_cols = ['open', 'high', 'low', 'close']
-                if all(col in df.columns.str.lower() for col in required_cols):
-                    print(f"Successfully loaded CSV with separator '{separator}'")
-                    break
-            except:
-                continue
-        else:
+        df = pd.read_csv(file_path, sep=separator, engine='pyarrow' if PYARROW_AVAILABLE else 'c')
+        
+        # Check if we have the required columns
+        required_cols = ['open', 'high', 'low', 'close']
+        if not all(col in df.columns.str.lower() for col in required_cols):
             raise ValueError("Could not parse CSV with any separator")
+        print(f"Successfully loaded CSV with separator '{separator}'")
         
         # Standardize column names
         df.columns = df.columns.str.lower().str.strip()
@@ -135,14 +467,8 @@ def load_csv_data(file_path, sep=','):
         
         # Select and clean the OHLCV columns
         ohlcv_cols = ['open', 'high', 'low', 'close', 'volume']
-        df = df[ohlcv_cols].copy()
-        
-        # Convert to numeric
-        for col in ohlcv_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Remove any rows with NaN values
-        df.dropna(inplace=True)
+        # Convert to numeric and remove any rows with NaN values (each step returns a new frame)
+        df = df[ohlcv_cols].apply(pd.to_numeric, errors='coerce').dropna()
         
         print(f"Loaded {len(df)} rows of data")
         return df
@@ -163,14 +489,17 @@ class EnhancedVolumeProfileAnalyzer:
         self.profile_data = None
         self.smart_levels = None
         self.volume_features = None
+        self._metrics_cache = None  # (profile_data, metrics) of the last metrics call
         
     def load_data(self, data):
         """Load OHLCV data"""
-        self.data = data.copy()
-        if not isinstance(self.data.index, pd.DatetimeIndex):
-            self.data.index = pd.to_datetime(self.data.index)
+        # The analyzer never writes into self.data, so the caller's frame is not copied
+        if isinstance(data.index, pd.DatetimeIndex):
+            self.data = data
+        else:
+            self.data = data.set_axis(pd.to_datetime(data.index))
     
-    def fetch_data_ccxt(self, symbol='BTC/USDT', timeframe='1d', limit=500, exchange='binance'):
+    def fetch_data_ccxt(self, symbol='BTC/USDT', timeframe='1d', limit=500, exchange='binance', use_cache=False):
         """
         Fetch data using CCXT and load it into the analyzer
         
@@ -179,8 +508,9 @@ class EnhancedVolumeProfileAnalyzer:
         timeframe (str): Timeframe
         limit (int): Number of candles
         exchange (str): Exchange name
+        use_cache (bool): Reuse downloads from the on-disk cache for up to one candle period
         """
-        self.data = fetch_crypto_data_ccxt(symbol, timeframe, limit, exchange)
+        self.data = fetch_crypto_data_ccxt(symbol, timeframe, limit, exchange, use_cache)
         return self.data
     
     def load_csv(self, file_path, sep=','):
@@ -196,36 +526,70 @@ class EnhancedVolumeProfileAnalyzer:
         
     def calculate_enhanced_volume_metrics(self):
         """Calculate enhanced volume metrics"""
-        df = self.data.copy()
-        
-        # Basic volume metrics
-        df['volume_sma_20'] = df['volume'].rolling(20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_sma_20']
-        df['volume_rsi'] = self._calculate_rsi(df['volume'], 14)
-        
-        # Enhanced volume calculations
-        df['money_flow'] = df['volume'] * (df['high'] + df['low'] + df['close']) / 3
-        df['enhanced_money_flow'] = df['money_flow'] * (1 + abs(df['close'].pct_change()))
-        
-        # Volume pressure indicators
-        df['buying_pressure'] = np.where(df['close'] > df['open'], df['volume'], 0)
-        df['selling_pressure'] = np.where(df['close'] < df['open'], df['volume'], 0)
-        df['volume_delta'] = df['buying_pressure'] - df['selling_pressure']
-        df['cumulative_delta'] = df['volume_delta'].cumsum()
-        
-        # Institutional flow estimation
-        df['institutional_threshold'] = df['volume_sma_20'] * 3
-        df['institutional_flow'] = np.where(df['volume'] > df['institutional_threshold'], 
-                                          df['volume'], 0)
-        
-        # Volume waves detection
-        df['volume_wave'] = np.where(df['volume'] > df['volume_sma_20'] * 1.5, 1, 0)
-        df['volume_anomaly'] = np.where(df['volume'] > df['volume_sma_20'] * 4, 1, 0)
-        
-        # Price-volume divergence
-        df['price_momentum'] = df['close'].pct_change(5).rolling(5).mean()
-        df['volume_momentum'] = df['volume'].pct_change(5).rolling(5).mean()
-        df['pv_divergence'] = df['price_momentum'] - df['volume_momentum']
+        data = self.data
+        open_ = data['open'].to_numpy(dtype=np.float64)
+        high = data['high'].to_numpy(dtype=np.float64)
+        low = data['low'].to_numpy(dtype=np.float64)
+        close = data['close'].to_numpy(dtype=np.float64)
+        volume = data['volume'].to_numpy(dtype=np.float64)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Basic volume metrics
+            volume_sma_20 = rolling_mean(volume, 20)
+            volume_ratio = volume / volume_sma_20
+            
+            # Enhanced volume calculations
+            money_flow = volume * (high + low + close) / 3
+            close_change = np.empty_like(close)
+            close_change[0] = np.nan
+            close_change[1:] = close[1:] / close[:-1] - 1
+            
+            # Volume pressure indicators: signed volume materialized once
+            is_buying = close > open_
+            is_selling = close < open_
+            volume_delta = np.where(is_buying, volume, np.where(is_selling, -volume, 0.0))
+            
+            # Running delta skips missing bars like Series.cumsum()
+            cumulative_delta = np.nancumsum(volume_delta)
+            cumulative_delta[np.isnan(volume_delta)] = np.nan
+            
+            # Institutional flow estimation
+            institutional_threshold = volume_sma_20 * 3
+            is_institutional = volume > institutional_threshold
+            
+            # Volume waves detection
+            volume_wave = volume > volume_sma_20 * 1.5
+            volume_anomaly = volume > volume_sma_20 * 4
+            
+            # One byte per bar carries every flag; direction is read back from it on demand
+            bar_flags = (is_institutional * np.uint8(FLAG_INSTITUTIONAL)
+                         | volume_wave * np.uint8(FLAG_VOLUME_WAVE)
+                         | volume_anomaly * np.uint8(FLAG_VOLUME_ANOMALY)
+                         | is_buying * np.uint8(FLAG_BUYING)
+                         | is_selling * np.uint8(FLAG_SELLING))
+            
+            # Price-volume divergence
+            price_momentum = smoothed_change(close, 5, 5)
+            volume_momentum = smoothed_change(volume, 5, 5)
+        
+        # Single assignment: one new frame instead of a block insert per column
+        df = data.assign(
+            volume_sma_20=volume_sma_20,
+            volume_ratio=volume_ratio,
+            volume_rsi=self._calculate_rsi(data['volume'], 14),
+            money_flow=money_flow,
+            enhanced_money_flow=money_flow * (1 + np.abs(close_change)),
+            volume_delta=volume_delta,
+            cumulative_delta=cumulative_delta,
+            institutional_threshold=institutional_threshold,
+            institutional_flow=np.where(is_institutional, volume, 0.0),
+            volume_wave=volume_wave.view(np.int8),
+            volume_anomaly=volume_anomaly.view(np.int8),
+            bar_flags=bar_flags,
+            price_momentum=price_momentum,
+            volume_momentum=volume_momentum,
+            pv_divergence=price_momentum - volume_momentum
+        )
         
         self.volume_features = df
         return df
@@ -242,79 +606,62 @@ class EnhancedVolumeProfileAnalyzer:
         if self.volume_features is None:
             self.calculate_enhanced_volume_metrics()
             
-        df = self.volume_features.tail(lookback).copy()
+        # Last `lookback` bars as flat array slices (no intermediate frame)
+        df = self.volume_features
+        start = max(len(df) - lookback, 0)
+        low = df['low'].to_numpy(dtype=np.float64)[start:]
+        high = df['high'].to_numpy(dtype=np.float64)[start:]
+        prof_vol = df[profile_type].to_numpy(dtype=np.float64)[start:]
+        bar_flags = df['bar_flags'].to_numpy()[start:]
         
         # Calculate profile range
-        profile_high = df['high'].max()
-        profile_low = df['low'].min()
+        profile_high = np.nanmax(high)
+        profile_low = np.nanmin(low)
         row_height = (profile_high - profile_low) / rows
         
-        # Initialize profile arrays
+        # Price rows (rows, 1) against bars (1, n_bars)
+        row_bottom = (profile_low + np.arange(rows) * row_height)[:, None]
+        row_top = row_bottom + row_height
+        
+        # Bars that intersect each row; flat bars carry no range to distribute
+        bar_range = high - low
+        intersects = (low <= row_top) & (high >= row_bottom) & (bar_range > 0)
+        
+        # Share of each bar's volume that falls inside each row, built in one
+        # preallocated (rows, n_bars) buffer; volume per unit of price is a per-bar vector
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_density = prof_vol / bar_range
+        portion = np.empty((rows, len(high)))
+        np.minimum(high, row_top, out=portion)
+        portion -= np.maximum(low, row_bottom)
+        portion *= volume_density
+        np.copyto(portion, 0.0, where=~intersects)
+        
+        # Masked reductions read the buffer in place instead of copying column subsets
+        is_buy = (bar_flags & FLAG_BUYING) != 0
+        total_vol = portion.sum(axis=1)
+        buy_vol = portion.sum(axis=1, where=is_buy)
+        sell_vol = portion.sum(axis=1, where=~is_buy)
+        inst_vol = portion.sum(axis=1, where=(bar_flags & FLAG_INSTITUTIONAL) != 0)
+        trade_count = intersects.sum(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_trade_size = np.where(trade_count > 0, total_vol / trade_count, 0.0)
+        
+        # Volume columns only feed plots, ranking and ratios, so they are stored as float32;
+        # price levels stay float64 because signals compare closes against them
         profile_data = {
-            'price_levels': [],
-            'total_volume': [],
-            'buy_volume': [],
-            'sell_volume': [],
-            'institutional_volume': [],
-            'trade_count': [],
-            'avg_trade_size': []
+            'price_levels': (row_bottom + row_top).ravel() / 2,
+            'total_volume': total_vol.astype(np.float32),
+            'buy_volume': buy_vol.astype(np.float32),
+            'sell_volume': sell_vol.astype(np.float32),
+            'institutional_volume': inst_vol.astype(np.float32),
+            'trade_count': trade_count,
+            'avg_trade_size': avg_trade_size.astype(np.float32)
         }
         
-        for row in range(rows):
-            row_bottom = profile_low + row * row_height
-            row_top = row_bottom + row_height
-            row_center = (row_bottom + row_top) / 2
-            
-            # Find bars that intersect with this price level
-            intersecting_bars = df[
-                (df['low'] <= row_top) & (df['high'] >= row_bottom)
-            ]
-            
-            if len(intersecting_bars) == 0:
-                profile_data['price_levels'].append(row_center)
-                for key in ['total_volume', 'buy_volume', 'sell_volume', 
-                           'institutional_volume', 'trade_count', 'avg_trade_size']:
-                    profile_data[key].append(0)
-                continue
-            
-            # Calculate volume distribution
-            total_vol = 0
-            buy_vol = 0
-            sell_vol = 0
-            inst_vol = 0
-            trade_count = 0
-            
-            for idx, bar in intersecting_bars.iterrows():
-                bar_range = bar['high'] - bar['low']
-                if bar_range == 0:
-                    continue
-                    
-                # Calculate overlap
-                overlap = min(bar['high'], row_top) - max(bar['low'], row_bottom)
-                volume_portion = (overlap / bar_range) * bar[profile_type]
-                
-                total_vol += volume_portion
-                trade_count += 1
-                
-                # Determine buy/sell pressure
-                if bar['close'] > bar['open']:
-                    buy_vol += volume_portion
-                else:
-                    sell_vol += volume_portion
-                
-                # Institutional volume
-                if bar['volume'] > bar['institutional_threshold']:
-                    inst_vol += volume_portion
-            
-            profile_data['price_levels'].append(row_center)
-            profile_data['total_volume'].append(total_vol)
-            profile_data['buy_volume'].append(buy_vol)
-            profile_data['sell_volume'].append(sell_vol)
-            profile_data['institutional_volume'].append(inst_vol)
-            profile_data['trade_count'].append(trade_count)
-            profile_data['avg_trade_size'].append(total_vol / trade_count if trade_count > 0 else 0)
-        
         self.profile_data = pd.DataFrame(profile_data)
+        self._metrics_cache = None
         return self.profile_data
     
     def detect_smart_levels(self, threshold_percentile=85, cluster_tolerance=0.002):
@@ -332,55 +679,27 @@ class EnhancedVolumeProfileAnalyzer:
         volume_threshold = np.percentile(self.profile_data['total_volume'], threshold_percentile)
         high_volume_levels = self.profile_data[
             self.profile_data['total_volume'] > volume_threshold
-        ].copy()
+        ]
         
         if len(high_volume_levels) == 0:
             self.smart_levels = pd.DataFrame()
             return self.smart_levels
         
         # Cluster nearby price levels
-        prices = high_volume_levels['price_levels'].values.reshape(-1, 1)
-        volumes = high_volume_levels['total_volume'].values
-        
-        # Use price clustering to group nearby levels
-        price_range = prices.max() - prices.min()
-        eps = price_range * cluster_tolerance
-        
-        # Simple clustering based on price proximity
-        clusters = []
-        used_indices = set()
-        
-        for i, price in enumerate(prices.flatten()):
-            if i in used_indices:
-                continue
-                
-            cluster_prices = [price]
-            cluster_volumes = [volumes[i]]
-            cluster_indices = [i]
-            
-            for j, other_price in enumerate(prices.flatten()):
-                if j != i and j not in used_indices:
-                    if abs(price - other_price) / price < cluster_tolerance:
-                        cluster_prices.append(other_price)
-                        cluster_volumes.append(volumes[j])
-                        cluster_indices.append(j)
-                        used_indices.add(j)
-            
-            used_indices.add(i)
-            
-            # Calculate cluster statistics
-            weighted_price = np.average(cluster_prices, weights=cluster_volumes)
-            total_volume = sum(cluster_volumes)
-            strength = len(cluster_prices)
-            
-            clusters.append({
-                'price': weighted_price,
-                'volume': total_volume,
-                'strength': strength,
-                'buy_volume': sum(high_volume_levels.iloc[cluster_indices]['buy_volume']),
-                'sell_volume': sum(high_volume_levels.iloc[cluster_indices]['sell_volume']),
-                'institutional_volume': sum(high_volume_levels.iloc[cluster_indices]['institutional_volume'])
-            })
+        prices = high_volume_levels['price_levels'].to_numpy(dtype=np.float64)
+        volumes = high_volume_levels['total_volume'].to_numpy(dtype=np.float64)
+        labels = cluster_levels(prices, cluster_tolerance)
+        
+        # Calculate cluster statistics
+        total_volume = np.bincount(labels, weights=volumes)
+        clusters = {
+            'price': np.bincount(labels, weights=prices * volumes) / total_volume,
+            'volume': total_volume,
+            'strength': np.bincount(labels),
+            'buy_volume': np.bincount(labels, weights=high_volume_levels['buy_volume'].to_numpy()),
+            'sell_volume': np.bincount(labels, weights=high_volume_levels['sell_volume'].to_numpy()),
+            'institutional_volume': np.bincount(labels, weights=high_volume_levels['institutional_volume'].to_numpy())
+        }
         
         self.smart_levels = pd.DataFrame(clusters).sort_values('volume', ascending=False)
         return self.smart_levels
@@ -390,37 +709,39 @@ class EnhancedVolumeProfileAnalyzer:
         if self.profile_data is None:
             self.build_volume_profile()
         
+        # Metrics only depend on the profile; reuse them until it is rebuilt
+        if self._metrics_cache is not None and self._metrics_cache[0] is self.profile_data:
+            return dict(self._metrics_cache[1])
+        
+        price_levels = self.profile_data['price_levels'].to_numpy()
+        level_volume = self.profile_data['total_volume'].to_numpy()
+        
         # Point of Control (PoC)
-        poc_idx = self.profile_data['total_volume'].idxmax()
-        poc_price = self.profile_data.loc[poc_idx, 'price_levels']
-        poc_volume = self.profile_data.loc[poc_idx, 'total_volume']
+        poc_idx = np.nanargmax(level_volume)
+        poc_price = price_levels[poc_idx]
+        poc_volume = level_volume[poc_idx]
         
         # Value Area (70% of volume)
-        total_volume = self.profile_data['total_volume'].sum()
+        total_volume = np.nansum(level_volume, dtype=np.float64)
         target_va_volume = total_volume * 0.70
         
-        # Sort by volume and find VA
-        sorted_profile = self.profile_data.sort_values('total_volume', ascending=False)
-        cumulative_volume = 0
-        va_levels = []
+        # Highest-volume levels first (NaN last) until 70% of the volume is covered
+        order = np.argsort(-level_volume, kind='stable')
+        cumulative_volume = np.cumsum(level_volume[order])
+        va_count = np.searchsorted(cumulative_volume, target_va_volume) + 1
+        va_levels = price_levels[order[:va_count]]
         
-        for idx, row in sorted_profile.iterrows():
-            cumulative_volume += row['total_volume']
-            va_levels.append(row['price_levels'])
-            if cumulative_volume >= target_va_volume:
-                break
-        
-        va_high = max(va_levels)
-        va_low = min(va_levels)
+        va_high = va_levels.max()
+        va_low = va_levels.min()
         
         # Volume distribution analysis
-        total_buy = self.profile_data['buy_volume'].sum()
-        total_sell = self.profile_data['sell_volume'].sum()
+        total_buy = np.nansum(self.profile_data['buy_volume'].to_numpy(), dtype=np.float64)
+        total_sell = np.nansum(self.profile_data['sell_volume'].to_numpy(), dtype=np.float64)
         net_delta = total_buy - total_sell
         delta_ratio = net_delta / (total_buy + total_sell) if (total_buy + total_sell) > 0 else 0
         
         # Institutional participation
-        total_institutional = self.profile_data['institutional_volume'].sum()
+        total_institutional = np.nansum(self.profile_data['institutional_volume'].to_numpy(), dtype=np.float64)
         institutional_ratio = total_institutional / total_volume if total_volume > 0 else 0
         
         metrics = {
@@ -433,33 +754,41 @@ class EnhancedVolumeProfileAnalyzer:
             'net_delta': net_delta,
             'delta_ratio': delta_ratio,
             'institutional_ratio': institutional_ratio,
-            'profile_balance': self._calculate_profile_balance()
+            'profile_balance': self._calculate_profile_balance(level_volume, price_levels, poc_idx)
         }
         
-        return metrics
+        self._metrics_cache = (self.profile_data, metrics)
+        return dict(metrics)
     
-    def _calculate_profile_balance(self):
+    def _calculate_profile_balance(self, level_volume=None, price_levels=None, poc_idx=None):
         """Calculate profile balance (above vs below PoC)"""
-        if self.profile_data is None:
-            return 0
-        
-        poc_idx = self.profile_data['total_volume'].idxmax()
-        poc_price = self.profile_data.loc[poc_idx, 'price_levels']
-        
-        above_poc = self.profile_data[self.profile_data['price_levels'] > poc_price]['total_volume'].sum()
-        below_poc = self.profile_data[self.profile_data['price_levels'] <= poc_price]['total_volume'].sum()
+        if level_volume is None:
+            if self.profile_data is None:
+                return 0
+            level_volume = self.profile_data['total_volume'].to_numpy()
+            price_levels = self.profile_data['price_levels'].to_numpy()
+        if poc_idx is None:
+            poc_idx = np.nanargmax(level_volume)
+        
+        above = price_levels > price_levels[poc_idx]
+        above_poc = np.nansum(level_volume[above], dtype=np.float64)
+        below_poc = np.nansum(level_volume[~above], dtype=np.float64)
         
         total = above_poc + below_poc
         return (above_poc - below_poc) / total if total > 0 else 0
     
     def _calculate_rsi(self, series, period=14):
         """Calculate RSI"""
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        values = series.to_numpy(dtype=np.float64)
+        delta = np.empty_like(values)
+        delta[0] = np.nan
+        delta[1:] = values[1:] - values[:-1]
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            rsi = 100 - (100 / (1 + rs))
+        return pd.Series(rsi, index=series.index)
     
     def plot_enhanced_volume_profile(self, figsize=(15, 10)):
         """Create comprehensive volume profile visualization"""
@@ -523,43 +852,56 @@ class EnhancedVolumeProfileAnalyzer:
         if self.volume_features is None:
             self.calculate_enhanced_volume_metrics()
         
-        df = self.volume_features.copy()
-        signals = pd.DataFrame(index=df.index)
+        df = self.volume_features
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume_ratio = df['volume_ratio'].to_numpy()
+        price_momentum = df['price_momentum'].to_numpy()
+        volume_momentum = df['volume_momentum'].to_numpy()
+        
+        # Direction of the cumulative delta, shared by the trend and reversal rules
+        cumulative_delta = df['cumulative_delta'].to_numpy()
+        cd_diff = np.empty_like(cumulative_delta)
+        cd_diff[:1] = np.nan
+        cd_diff[1:] = cumulative_delta[1:] - cumulative_delta[:-1]
+        cd_up = cd_diff > 0
+        cd_down = cd_diff < 0
         
         # Add trend indicators
-        df['sma_20'] = df['close'].rolling(20).mean()
-        df['sma_50'] = df['close'].rolling(50).mean()
-        df['ema_12'] = df['close'].ewm(span=12).mean()
-        df['ema_26'] = df['close'].ewm(span=26).mean()
-        df['macd'] = df['ema_12'] - df['ema_26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['rsi'] = self._calculate_rsi(df['close'], 14)
+        sma_20 = rolling_mean(close, 20)
+        sma_50 = rolling_mean(close, 50)
+        ema_12 = df['close'].ewm(span=12).mean()
+        ema_26 = df['close'].ewm(span=26).mean()
+        macd = ema_12 - ema_26
+        macd_signal = macd.ewm(span=9).mean().to_numpy()
+        macd = macd.to_numpy()
+        rsi = self._calculate_rsi(df['close'], 14).to_numpy()
         
         # Market regime detection
-        df['trend_strength'] = (df['close'] - df['sma_50']) / df['sma_50']
-        df['is_uptrend'] = (df['sma_20'] > df['sma_50']) & (df['close'] > df['sma_20'])
-        df['is_downtrend'] = (df['sma_20'] < df['sma_50']) & (df['close'] < df['sma_20'])
-        df['is_ranging'] = ~(df['is_uptrend'] | df['is_downtrend'])
+        is_uptrend = (sma_20 > sma_50) & (close > sma_20)
+        is_downtrend = (sma_20 < sma_50) & (close < sma_20)
+        is_ranging = ~(is_uptrend | is_downtrend)
+        
+        signals = {}
         
         # Enhanced volume signals with trend filtering
-        signals['volume_breakout'] = (df['volume_ratio'] > 2.5).astype(int)  # Higher threshold
-        signals['volume_confirmation'] = (df['volume_ratio'] > 1.5) & (df['volume_ratio'] < 3.0)
-        signals['institutional_flow'] = (df['institutional_flow'] > 0).astype(int)
+        signals['volume_breakout'] = volume_ratio > 2.5  # Higher threshold
+        signals['volume_confirmation'] = (volume_ratio > 1.5) & (volume_ratio < 3.0)
+        signals['institutional_flow'] = df['institutional_flow'].to_numpy() > 0
         
         # Trend-following signals
         signals['bullish_trend'] = (
-            df['is_uptrend'] & 
-            (df['macd'] > df['macd_signal']) &
-            (df['rsi'] > 45) & (df['rsi'] < 75) &
-            (df['cumulative_delta'].diff() > 0)
-        ).astype(int)
+            is_uptrend &
+            (macd > macd_signal) &
+            (rsi > 45) & (rsi < 75) &
+            cd_up
+        )
         
         signals['bearish_trend'] = (
-            df['is_downtrend'] & 
-            (df['macd'] < df['macd_signal']) &
-            (df['rsi'] < 55) & (df['rsi'] > 25) &
-            (df['cumulative_delta'].diff() < 0)
-        ).astype(int)
+            is_downtrend &
+            (macd < macd_signal) &
+            (rsi < 55) & (rsi > 25) &
+            cd_down
+        )
         
         # Volume Profile specific signals
         if self.profile_data is not None:
@@ -570,64 +912,77 @@ class EnhancedVolumeProfileAnalyzer:
             
             # Support/Resistance signals
             signals['poc_support'] = (
-                (df['close'] <= poc_price * 1.02) & 
-                (df['close'] >= poc_price * 0.98) &
-                df['is_uptrend'] &
-                (df['volume_ratio'] > 1.2)
-            ).astype(int)
+                (close <= poc_price * 1.02) &
+                (close >= poc_price * 0.98) &
+                is_uptrend &
+                (volume_ratio > 1.2)
+            )
             
             signals['va_breakout'] = (
-                ((df['close'] > va_high) & df['is_uptrend']) |
-                ((df['close'] < va_low) & df['is_downtrend'])
-            ).astype(int)
+                ((close > va_high) & is_uptrend) |
+                ((close < va_low) & is_downtrend)
+            )
         else:
-            signals['poc_support'] = 0
-            signals['va_breakout'] = 0
+            signals['poc_support'] = np.zeros(len(close), dtype=bool)
+            signals['va_breakout'] = np.zeros(len(close), dtype=bool)
         
         # Mean reversion signals for ranging markets
         signals['oversold_reversal'] = (
-            df['is_ranging'] &
-            (df['rsi'] < 30) &
-            (df['volume_ratio'] > 1.5) &
-            (df['cumulative_delta'].diff() > 0)
-        ).astype(int)
+            is_ranging &
+            (rsi < 30) &
+            (volume_ratio > 1.5) &
+            cd_up
+        )
         
         signals['overbought_reversal'] = (
-            df['is_ranging'] &
-            (df['rsi'] > 70) &
-            (df['volume_ratio'] > 1.5) &
-            (df['cumulative_delta'].diff() < 0)
-        ).astype(int)
+            is_ranging &
+            (rsi > 70) &
+            (volume_ratio > 1.5) &
+            cd_down
+        )
         
         # Volume divergence signals (early reversal detection)
         signals['bullish_divergence'] = (
-            (df['price_momentum'] < -0.02) & 
-            (df['volume_momentum'] > 0.1) &
-            (df['rsi'] < 40)
-        ).astype(int)
+            (price_momentum < -0.02) &
+            (volume_momentum > 0.1) &
+            (rsi < 40)
+        )
         
         signals['bearish_divergence'] = (
-            (df['price_momentum'] > 0.02) & 
-            (df['volume_momentum'] < -0.1) &
-            (df['rsi'] > 60)
-        ).astype(int)
+            (price_momentum > 0.02) &
+            (volume_momentum < -0.1) &
+            (rsi > 60)
+        )
         
         # Exit signals for risk management
         signals['profit_take'] = (
-            (df['rsi'] > 80) | (df['rsi'] < 20) |
-            (df['volume_ratio'] < 0.5)  # Very low volume
-        ).astype(int)
+            (rsi > 80) | (rsi < 20) |
+            (volume_ratio < 0.5)  # Very low volume
+        )
+        
+        # 0/1 flags, except volume_confirmation which stays boolean
+        signals = pd.DataFrame(
+            {name: flag if name == 'volume_confirmation' else flag.view(np.int8)
+             for name, flag in signals.items()},
+            index=df.index
+        )
         
         return signals
     
     def backtest_volume_strategy(self, initial_capital=100000, max_position_size=0.1, stop_loss=0.05, take_profit=0.15):
         """Enhanced backtest with proper risk management and position sizing"""
         signals = self.generate_trading_signals()
-        df = self.volume_features.copy()
+        df = self.volume_features
+        
+        # Price and bar-to-bar returns as arrays, shared by the position loop and the P&L
+        price = df['close'].to_numpy(dtype=np.float64)
+        returns = np.empty_like(price)
+        returns[:1] = np.nan
+        returns[1:] = price[1:] / price[:-1] - 1
         
-        portfolio = pd.DataFrame(index=df.index)
-        portfolio['price'] = df['close']
-        portfolio['returns'] = df['close'].pct_change()
+        # Return, position and equity columns are stored as float32 for the caller;
+        # the backtest and its metrics run on the float64 arrays
+        portfolio = pd.DataFrame({'price': price, 'returns': returns.astype(np.float32)}, index=df.index)
         
         # Calculate position signals with proper weighting
         portfolio['long_signal'] = (
@@ -656,116 +1011,61 @@ class EnhancedVolumeProfileAnalyzer:
         )
         
         # Apply risk management
-        portfolio['position'] = 0.0
-        portfolio['entry_price'] = 0.0
+        (position, entry_price, trade_entry, trade_exit,
+         trade_size, trade_return, trade_type) = run_backtest(
+            price,
+            portfolio['target_position'].to_numpy(dtype=np.float64),
+            signals['profit_take'].to_numpy(dtype=np.bool_),
+            stop_loss, take_profit
+        )
+        
+        # Strategy returns, equity curve and max drawdown in one pass
+        strategy_returns, cumulative_returns, max_drawdown, mean_return, return_variance = equity_curve(position, returns)
+        portfolio_value = initial_capital * cumulative_returns
+        
+        portfolio['position'] = position.astype(np.float32)
+        portfolio['entry_price'] = entry_price
         portfolio['cash'] = initial_capital
         portfolio['holdings'] = 0.0
-        portfolio['portfolio_value'] = initial_capital
+        portfolio['portfolio_value'] = portfolio_value.astype(np.float32)
         
         # Track trades
-        trades = []
-        current_position = 0.0
-        entry_price = 0.0
-        
-        for i in range(1, len(portfolio)):
-            current_price = portfolio['price'].iloc[i]
-            target_pos = portfolio['target_position'].iloc[i]
-            
-            # Exit conditions (stop loss, take profit, or exit signal)
-            if current_position != 0:
-                price_change = (current_price - entry_price) / entry_price
-                
-                # Long position exits
-                if current_position > 0:
-                    if (price_change <= -stop_loss or  # Stop loss
-                        price_change >= take_profit or   # Take profit
-                        signals['profit_take'].iloc[i] or  # Signal exit
-                        target_pos < 0):  # Signal reversal
-                        
-                        # Close long position
-                        trade_return = current_position * price_change
-                        trades.append({
-                            'entry_price': entry_price,
-                            'exit_price': current_price,
-                            'position_size': current_position,
-                            'return': trade_return,
-                            'type': 'long_exit'
-                        })
-                        current_position = 0.0
-                        entry_price = 0.0
-                
-                # Short position exits  
-                elif current_position < 0:
-                    if (price_change >= stop_loss or   # Stop loss (opposite for short)
-                        price_change <= -take_profit or  # Take profit (opposite for short)
-                        signals['profit_take'].iloc[i] or  # Signal exit
-                        target_pos > 0):  # Signal reversal
-                        
-                        # Close short position
-                        trade_return = -current_position * price_change  # Negative because short
-                        trades.append({
-                            'entry_price': entry_price,
-                            'exit_price': current_price,
-                            'position_size': current_position,
-                            'return': trade_return,
-                            'type': 'short_exit'
-                        })
-                        current_position = 0.0
-                        entry_price = 0.0
-            
-            # Entry conditions (only if no current position)
-            if current_position == 0 and abs(target_pos) > 0.01:  # Minimum threshold
-                current_position = target_pos
-                entry_price = current_price
-                
-                trades.append({
-                    'entry_price': entry_price,
-                    'exit_price': None,
-                    'position_size': current_position,
-                    'return': None,
-                    'type': 'long_entry' if current_position > 0 else 'short_entry'
-                })
-            
-            # Update portfolio
-            portfolio.iloc[i, portfolio.columns.get_loc('position')] = current_position
-            portfolio.iloc[i, portfolio.columns.get_loc('entry_price')] = entry_price if current_position != 0 else 0
-        
-        # Calculate strategy returns
-        portfolio['strategy_returns'] = 0.0
-        for i in range(1, len(portfolio)):
-            if portfolio['position'].iloc[i-1] != 0:
-                position = portfolio['position'].iloc[i-1]
-                price_return = portfolio['returns'].iloc[i]
-                strategy_return = position * price_return  # Position * market return
-                portfolio.iloc[i, portfolio.columns.get_loc('strategy_returns')] = strategy_return
-        
-        portfolio['cumulative_returns'] = (1 + portfolio['strategy_returns']).cumprod()
-        portfolio['portfolio_value'] = initial_capital * portfolio['cumulative_returns']
+        trades = [
+            {
+                'entry_price': entry,
+                'exit_price': None if code < 2 else exit_,
+                'position_size': size,
+                'return': None if code < 2 else result,
+                'type': TRADE_TYPES[code]
+            }
+            for entry, exit_, size, result, code in zip(
+                trade_entry.tolist(), trade_exit.tolist(), trade_size.tolist(),
+                trade_return.tolist(), trade_type.tolist()
+            )
+        ]
+        
+        portfolio['strategy_returns'] = strategy_returns.astype(np.float32)
+        portfolio['cumulative_returns'] = cumulative_returns.astype(np.float32)
         
         # Calculate enhanced performance metrics
-        total_return = portfolio['cumulative_returns'].iloc[-1] - 1
-        strategy_returns_clean = portfolio['strategy_returns'].dropna()
+        total_return = cumulative_returns[-1] - 1
         
-        if len(strategy_returns_clean) > 0 and strategy_returns_clean.std() > 0:
-            volatility = strategy_returns_clean.std() * np.sqrt(252)
-            sharpe_ratio = (strategy_returns_clean.mean() * 252) / volatility
+        if return_variance > 0:
+            volatility = np.sqrt(return_variance) * np.sqrt(252)
+            sharpe_ratio = (mean_return * 252) / volatility
         else:
             volatility = 0
             sharpe_ratio = 0
         
-        # Calculate maximum drawdown
-        rolling_max = portfolio['cumulative_returns'].expanding().max()
-        drawdown = (portfolio['cumulative_returns'] / rolling_max - 1)
-        max_drawdown = drawdown.min()
-        
         # Calculate win rate and other trade statistics
-        completed_trades = [t for t in trades if t['return'] is not None]
-        if completed_trades:
-            wins = len([t for t in completed_trades if t['return'] > 0])
-            total_trades = len(completed_trades)
+        completed_returns = trade_return[trade_type >= 2]  # exit records only
+        if len(completed_returns):
+            win_mask = completed_returns > 0
+            wins = int(win_mask.sum())
+            total_trades = len(completed_returns)
             win_rate = wins / total_trades
-            avg_win = np.mean([t['return'] for t in completed_trades if t['return'] > 0]) if wins > 0 else 0
-            avg_loss = np.mean([t['return'] for t in completed_trades if t['return'] < 0]) if (total_trades - wins) > 0 else 0
+            avg_win = completed_returns[win_mask].mean() if wins > 0 else 0
+            avg_loss = completed_returns[completed_returns < 0].mean() if (total_trades - wins) > 0 else 0
             profit_factor = abs(avg_win * wins / (avg_loss * (total_trades - wins))) if avg_loss != 0 else float('inf')
         else:
             win_rate = 0
@@ -779,7 +1079,7 @@ class EnhancedVolumeProfileAnalyzer:
             'annualized_volatility': volatility,
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown': max_drawdown,
-            'final_portfolio_value': portfolio['portfolio_value'].iloc[-1],
+            'final_portfolio_value': portfolio_value[-1],
             'total_trades': total_trades,
             'win_rate': win_rate,
             'avg_win': avg_win,
@@ -821,12 +1121,8 @@ def analyze_crypto_data_csv(file_path):
         print(f"Error loading CSV: {e}")
         return None, None, None
 
-def run_complete_analysis(analyzer):
-    """Run complete analysis on loaded data"""
-    if analyzer.data is None:
-        print("No data loaded!")
-        return None, None, None
-    
+def _run_analysis_pipeline(analyzer):
+    """Compute features, profile, levels, signals and backtest on the analyzer's data"""
     # Calculate enhanced metrics
     volume_features = analyzer.calculate_enhanced_volume_metrics()
     
@@ -845,6 +1141,56 @@ def run_complete_analysis(analyzer):
     # Run backtest
     portfolio, performance = analyzer.backtest_volume_strategy()
     
+    return smart_levels, metrics, performance
+
+
+def _analyze_symbol_worker(data):
+    """
+    Process-pool entry point: run the analysis pipeline on one symbol's data.
+    Returns the analyzer with its results so the parent can report and plot.
+    """
+    analyzer = EnhancedVolumeProfileAnalyzer()
+    analyzer.load_data(data)
+    return (analyzer,) + _run_analysis_pipeline(analyzer)
+
+
+def _backtest_strategy_worker(analyzer, strategy, initial_capital):
+    """Process-pool entry point: backtest one parameter set on an analyzer with features already built"""
+    return analyzer.backtest_volume_strategy(
+        initial_capital=initial_capital,
+        max_position_size=strategy['max_pos'],
+        stop_loss=strategy['stop_loss'],
+        take_profit=strategy['take_profit']
+    )
+
+
+def backtest_strategies(analyzer, strategies, initial_capital=100000):
+    """
+    Backtest several parameter sets ('max_pos', 'stop_loss', 'take_profit') in parallel processes.
+    Features and the volume profile should be built on `analyzer` first; each worker gets a copy.
+    
+    Returns:
+    list: (portfolio, performance) per strategy, in the order given
+    """
+    with ProcessPoolExecutor(max_workers=min(len(strategies), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_backtest_strategy_worker, analyzer, strategy, initial_capital)
+                   for strategy in strategies]
+        return [future.result() for future in futures]
+
+
+def run_complete_analysis(analyzer, results=None):
+    """
+    Run complete analysis on loaded data
+    `results` takes precomputed (smart_levels, metrics, performance), e.g. from a worker process.
+    """
+    if analyzer.data is None:
+        print("No data loaded!")
+        return None, None, None
+    
+    if results is None:
+        results = _run_analysis_pipeline(analyzer)
+    smart_levels, metrics, performance = results
+    
     # Create visualization
     fig = analyzer.plot_enhanced_volume_profile()
     
@@ -857,8 +1203,8 @@ def run_complete_analysis(analyzer):
     
     print("\n=== Smart Levels ===")
     if len(smart_levels) > 0:
-        for idx, level in smart_levels.head().iterrows():
-            print(f"Level: ${level['price']:.2f}, Volume: {level['volume']:.0f}, Strength: {level['strength']}")
+        for level in smart_levels.head().itertuples(index=False):
+            print(f"Level: ${level.price:.2f}, Volume: {level.volume:.0f}, Strength: {level.strength}")
     else:
         print("No smart levels detected")
     
@@ -910,12 +1256,20 @@ def demo_multiple_symbols():
     """Demo function to analyze multiple cryptocurrency symbols"""
     symbols = ['BTC/USDT', 'ETH/USDT', 'ADA/USDT', 'SOL/USDT']
     
-    for symbol in symbols:
+    # All symbols are downloaded concurrently up front
+    datasets = fetch_multiple_symbols_ccxt(symbols, timeframe='1d', limit=200)
+    if not datasets:
+        return
+    
+    # The CPU-bound analysis runs in one process per symbol; reporting and plotting stay in this process
+    with ProcessPoolExecutor(max_workers=min(len(datasets), os.cpu_count() or 1)) as executor:
+        futures = {symbol: executor.submit(_analyze_symbol_worker, data) for symbol, data in datasets.items()}
+    
+    for symbol, future in futures.items():
         print(f"\n{'='*20} {symbol} {'='*20}")
         try:
-            analyzer = EnhancedVolumeProfileAnalyzer()
-            data = analyzer.fetch_data_ccxt(symbol=symbol, timeframe='1d', limit=200)
-            analyzer, metrics, performance = run_complete_analysis(analyzer)
+            analyzer, *results = future.result()
+            analyzer, metrics, performance = run_complete_analysis(analyzer, results)
             
             # Quick summary
             if metrics:
@@ -925,8 +1279,6 @@ def demo_multiple_symbols():
                 
         except Exception as e:
             print(f"Failed to analyze {symbol}: {e}")
-            
-        time.sleep(1)  # Rate limiting
 
 # Uncomment to run multi-symbol demo
 # demo_multiple_symbols() 
\ No newline at end of file
@@ -11,10 +11,18 @@ import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import ccxt
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
 from typing import Optional
 
+# Chart lines are thinned to about this many points; more cannot be resolved at the saved size
+MAX_PLOT_POINTS = 2000
+CHART_NUM = 'eth_btc_extended_analysis'
+
+# ETH/BTC ratio regime codes relative to the historical average
+REGIME_LABELS = {1: 'STRONG', 0: 'NEUTRAL', -1: 'WEAK'}
+
 class ExtendedETHBTCAnalyzer:
     def __init__(self):
         self.exchange = ccxt.binance({
@@ -22,29 +30,40 @@ class ExtendedETHBTCAnalyzer:
             'rateLimit': 1200,
         })
         self.historical_data_dir = "historical_data"
+        # Keep-alive session so repeated CoinGecko calls reuse the TLS connection
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
         
     def load_extended_historical_data(self) -> Optional[pd.DataFrame]:
         """
         Load extended historical data from various sources
         """
+        required_cols = {'btc_market_cap', 'eth_market_cap', 'eth_btc_market_cap_ratio'}
+        
         data_files = [
             "extended_market_cap_data_2021_present.csv",  # Mock data
             "btc_eth_historical_combined.csv",            # Manual download
             "yahoo_finance_combined.csv"                   # Yahoo Finance
         ]
         
+        # One directory listing instead of an exists() call per candidate
+        try:
+            with os.scandir(self.historical_data_dir) as entries:
+                present = {entry.name for entry in entries}
+        except FileNotFoundError:
+            present = set()
+        
         for filename in data_files:
             filepath = os.path.join(self.historical_data_dir, filename)
-            if os.path.exists(filepath):
+            if filename in present:
                 print(f"📂 Loading historical data from: {filename}")
                 try:
-                    df = pd.read_csv(filepath)
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    df.set_index('timestamp', inplace=True)
+                    # Timestamps are parsed into the index during the read; known columns skip type inference
+                    df = pd.read_csv(filepath, engine='c', index_col='timestamp', parse_dates=['timestamp'],
+                                     dtype=dict.fromkeys(required_cols, 'float64'))
                     
                     # Ensure required columns exist
-                    required_cols = ['btc_market_cap', 'eth_market_cap', 'eth_btc_market_cap_ratio']
-                    if all(col in df.columns for col in required_cols):
+                    if required_cols.issubset(df.columns):
                         print(f"✅ Loaded {len(df)} data points from {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}")
                         return df
                     else:
@@ -68,7 +87,7 @@ class ExtendedETHBTCAnalyzer:
                 'include_24hr_change': 'true'
             }
             
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 return {
@@ -82,7 +101,36 @@ class ExtendedETHBTCAnalyzer:
             print(f"Warning: Could not fetch current data: {e}")
             return None
 
-    def analyze_market_cap_trends(self, df: pd.DataFrame):
+    def _compute_ratio_stats(self, df: pd.DataFrame) -> dict:
+        """
+        ETH/BTC ratio summary shared by the trend report and the chart
+        (current, mean, max, min and the dates of the extremes; NaN-skipping like the pandas reductions)
+        """
+        ratio = df['eth_btc_market_cap_ratio'].to_numpy()
+        max_idx = np.nanargmax(ratio)
+        min_idx = np.nanargmin(ratio)
+        return {
+            'current': ratio[-1],
+            'mean': np.nanmean(ratio),
+            'max': ratio[max_idx],
+            'min': ratio[min_idx],
+            'idxmax': df.index[max_idx],
+            'idxmin': df.index[min_idx]
+        }
+
+    def classify_ratio_regimes(self, df: pd.DataFrame, ratio_stats: Optional[dict] = None) -> pd.Series:
+        """
+        Per-date ETH/BTC regime: 1 (STRONG) above 1.1x the historical average ratio,
+        -1 (WEAK) below 0.9x, 0 (NEUTRAL) otherwise. See REGIME_LABELS.
+        """
+        if ratio_stats is None:
+            ratio_stats = self._compute_ratio_stats(df)
+        ratio = df['eth_btc_market_cap_ratio'].to_numpy()
+        avg_ratio = ratio_stats['mean']
+        regimes = np.select([ratio > avg_ratio * 1.1, ratio < avg_ratio * 0.9], [1, -1], default=0)
+        return pd.Series(regimes.astype(np.int8), index=df.index, name='eth_btc_regime')
+
+    def analyze_market_cap_trends(self, df: pd.DataFrame, ratio_stats: Optional[dict] = None):
         """
         Analyze long-term trends in market cap ratios
         """
@@ -90,14 +138,16 @@ class ExtendedETHBTCAnalyzer:
         print("=" * 60)
         
         # Calculate key statistics
-        current_ratio = df['eth_btc_market_cap_ratio'].iloc[-1]
-        max_ratio = df['eth_btc_market_cap_ratio'].max()
-        min_ratio = df['eth_btc_market_cap_ratio'].min()
-        avg_ratio = df['eth_btc_market_cap_ratio'].mean()
+        if ratio_stats is None:
+            ratio_stats = self._compute_ratio_stats(df)
+        current_ratio = ratio_stats['current']
+        max_ratio = ratio_stats['max']
+        min_ratio = ratio_stats['min']
+        avg_ratio = ratio_stats['mean']
         
         # Find significant dates
-        max_date = df['eth_btc_market_cap_ratio'].idxmax()
-        min_date = df['eth_btc_market_cap_ratio'].idxmin()
+        max_date = ratio_stats['idxmax']
+        min_date = ratio_stats['idxmin']
         
         print(f"📈 ETH/BTC Market Cap Ratio Analysis:")
         print(f"   Current:     {current_ratio:.4f}")
@@ -108,17 +158,19 @@ class ExtendedETHBTCAnalyzer:
         
         # Market cycle analysis
         print(f"\n🔄 Market Cycle Insights:")
-        if current_ratio > avg_ratio * 1.1:
+        current_regime = self.classify_ratio_regimes(df, ratio_stats).iloc[-1]
+        if current_regime == 1:
             print(f"   🔥 ETH is relatively STRONG vs BTC ({current_ratio/avg_ratio:.1f}x above average)")
-        elif current_ratio < avg_ratio * 0.9:
+        elif current_regime == -1:
             print(f"   ❄️  ETH is relatively WEAK vs BTC ({avg_ratio/current_ratio:.1f}x below average)")
         else:
             print(f"   ⚖️  ETH/BTC ratio is near historical average")
             
         # Trend analysis (last 90 days vs last 365 days)
         if len(df) >= 365:
-            recent_90d = df['eth_btc_market_cap_ratio'].tail(90).mean()
-            year_avg = df['eth_btc_market_cap_ratio'].tail(365).mean()
+            ratio = df['eth_btc_market_cap_ratio'].to_numpy()
+            recent_90d = np.nanmean(ratio[-90:])
+            year_avg = np.nanmean(ratio[-365:])
             
             if recent_90d > year_avg * 1.05:
                 print(f"   📈 Recent 90-day trend: UPWARD ({recent_90d/year_avg:.1f}x above year average)")
@@ -127,19 +179,30 @@ class ExtendedETHBTCAnalyzer:
             else:
                 print(f"   ➡️  Recent 90-day trend: SIDEWAYS")
 
-    def create_extended_chart(self, df: pd.DataFrame):
+    def create_extended_chart(self, df: pd.DataFrame, ratio_stats: Optional[dict] = None):
         """
         Create comprehensive chart with 2021-present data
         """
+        if ratio_stats is None:
+            ratio_stats = self._compute_ratio_stats(df)
         current_data = self.get_current_market_data()
         
-        # Create 4-panel comprehensive chart
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 12))
+        # Create 4-panel comprehensive chart, reusing the figure from a previous call if it is still open
+        if plt.fignum_exists(CHART_NUM):
+            fig = plt.figure(CHART_NUM)
+            fig.clear()
+        else:
+            fig = plt.figure(CHART_NUM, figsize=(20, 12))
+        ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
         fig.suptitle(f'ETH vs BTC Extended Analysis: 2021 to Present ({len(df)} Days)', 
                      fontsize=16, fontweight='bold')
         
+        # Long histories are thinned for display only; statistics use every row
+        stride = -(-len(df) // MAX_PLOT_POINTS)
+        plot_df = df.iloc[::stride]
+        
         # Chart 1: ETH/BTC Market Cap Ratio over time
-        ax1.plot(df.index, df['eth_btc_market_cap_ratio'], 
+        ax1.plot(plot_df.index, plot_df['eth_btc_market_cap_ratio'], 
                 color='purple', linewidth=2, label='ETH/BTC Market Cap Ratio')
         ax1.set_title('ETH/BTC Market Cap Ratio (2021-Present)', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Market Cap Ratio', fontsize=12)
@@ -147,7 +210,7 @@ class ExtendedETHBTCAnalyzer:
         ax1.legend()
         
         # Add horizontal lines for key levels
-        avg_ratio = df['eth_btc_market_cap_ratio'].mean()
+        avg_ratio = ratio_stats['mean']
         ax1.axhline(y=avg_ratio, color='orange', linestyle='--', alpha=0.7, label=f'Average: {avg_ratio:.4f}')
         
         if current_data:
@@ -162,13 +225,13 @@ class ExtendedETHBTCAnalyzer:
         ax2_twin2.spines['right'].set_position(('outward', 60))
         
         # Market caps
-        line1 = ax2.plot(df.index, df['btc_market_cap'] / 1e12, 
+        line1 = ax2.plot(plot_df.index, plot_df['btc_market_cap'] / 1e12, 
                         color='orange', linewidth=2.5, label='BTC Market Cap (T USD)')
-        line2 = ax2_twin1.plot(df.index, df['eth_market_cap'] / 1e12,
+        line2 = ax2_twin1.plot(plot_df.index, plot_df['eth_market_cap'] / 1e12,
                               color='blue', linewidth=2.5, label='ETH Market Cap (T USD)')
         
         # ETH/BTC ratio overlay
-        line3 = ax2_twin2.plot(df.index, df['eth_btc_market_cap_ratio'],
+        line3 = ax2_twin2.plot(plot_df.index, plot_df['eth_btc_market_cap_ratio'],
                               color='purple', linewidth=3, alpha=0.8, linestyle='--', 
                               label='ETH/BTC Ratio')
         
@@ -188,7 +251,7 @@ class ExtendedETHBTCAnalyzer:
         ax2.legend(lines, labels, loc='upper left')
         
         # Chart 3: BTC/ETH Market Cap Ratio (inverted)
-        ax3.plot(df.index, df['btc_eth_market_cap_ratio'], 
+        ax3.plot(plot_df.index, plot_df['btc_eth_market_cap_ratio'], 
                 color='darkorange', linewidth=2, label='BTC/ETH Market Cap Ratio')
         ax3.set_title('BTC/ETH Market Cap Ratio (Inverted)', fontsize=14, fontweight='bold')
         ax3.set_ylabel('BTC/ETH Ratio', fontsize=12)
@@ -199,23 +262,26 @@ class ExtendedETHBTCAnalyzer:
         # Calculate 30-day rolling correlation and volatility
         if len(df) >= 30:
             window = 30
-            df_rolling = df.rolling(window=window)
-            eth_volatility = df_rolling['eth_market_cap'].std() / df_rolling['eth_market_cap'].mean()
-            btc_volatility = df_rolling['btc_market_cap'].std() / df_rolling['btc_market_cap'].mean()
+            # One rolling pass over both market cap columns
+            df_rolling = df[['eth_market_cap', 'btc_market_cap']].rolling(window=window)
+            volatility = df_rolling.std() / df_rolling.mean()
+            eth_volatility = volatility['eth_market_cap']
+            btc_volatility = volatility['btc_market_cap']
             
-            ax4.plot(df.index, eth_volatility, color='blue', linewidth=2, label=f'ETH Volatility ({window}d)')
-            ax4.plot(df.index, btc_volatility, color='orange', linewidth=2, label=f'BTC Volatility ({window}d)')
+            ax4.plot(plot_df.index, eth_volatility.iloc[::stride], color='blue', linewidth=2, label=f'ETH Volatility ({window}d)')
+            ax4.plot(plot_df.index, btc_volatility.iloc[::stride], color='orange', linewidth=2, label=f'BTC Volatility ({window}d)')
             
             ax4.set_title(f'Market Cap Volatility Comparison ({window}-day rolling)', fontsize=14, fontweight='bold')
             ax4.set_ylabel('Volatility (CV)', fontsize=12)
             ax4.grid(True, alpha=0.3)
             ax4.legend()
         
-        # Format x-axes
-        for ax in [ax1, ax2, ax3, ax4]:
+        # Format x-axes; tickers are bound to the axis they are set on, so each axis gets its own
+        date_axes = (ax1, ax2, ax3, ax4)
+        for ax in date_axes:
             ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
             ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        plt.setp([ax.xaxis.get_majorticklabels() for ax in date_axes], rotation=45)
         
         # Add summary statistics
         stats_text = f"""Extended Analysis Summary (2021-Present):
@@ -224,10 +290,10 @@ Data Points: {len(df)} days
 Date Range: {df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}
 
 ETH/BTC Market Cap Ratio:
-  Current: {df['eth_btc_market_cap_ratio'].iloc[-1]:.4f}
-  Average: {df['eth_btc_market_cap_ratio'].mean():.4f}
-  Maximum: {df['eth_btc_market_cap_ratio'].max():.4f}
-  Minimum: {df['eth_btc_market_cap_ratio'].min():.4f}"""
+  Current: {ratio_stats['current']:.4f}
+  Average: {ratio_stats['mean']:.4f}
+  Maximum: {ratio_stats['max']:.4f}
+  Minimum: {ratio_stats['min']:.4f}"""
         
         if current_data:
             stats_text += f"""
@@ -273,12 +339,13 @@ def main():
         print("3. Or install yfinance: pip install yfinance")
         return
     
-    # Analyze trends
-    analyzer.analyze_market_cap_trends(historical_df)
+    # Analyze trends (ratio statistics are computed once and shared with the chart)
+    ratio_stats = analyzer._compute_ratio_stats(historical_df)
+    analyzer.analyze_market_cap_trends(historical_df, ratio_stats)
     
     # Create comprehensive chart
     print(f"\n📊 Creating extended analysis chart...")
-    analyzer.create_extended_chart(historical_df)
+    analyzer.create_extended_chart(historical_df, ratio_stats)
     
     print("\n✅ Extended analysis complete!")
     print("📈 This chart shows ETH/BTC market cap insights from 2021 to present")
@@ -1,18 +1,80 @@
 import ccxt
 import pandas as pd
 import numpy as np
+import os
+import sys
+import matplotlib
+if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+    matplotlib.use('Agg')  # Headless server: render straight to PNG, no GUI backend
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from matplotlib.lines import Line2D
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import time
+import asyncio
 import warnings
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
+from _cache import FileCache
 
 warnings.filterwarnings('ignore')
 
+# orjson is optional; it only speeds up parsing the API and local JSON payloads
+ORJSON_AVAILABLE = True
+try:
+    import orjson
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Response cache lifetimes (seconds). Current prices must stay fresher than the 60 s streaming cadence.
+SIMPLE_PRICE_TTL = 30
+MARKET_CHART_TTL = 12 * 60 * 60
+
+# Numeric fields of get_current_market_data recorded by the real-time stream
+STREAM_FIELDS = ('btc_price_usd', 'eth_price_usd', 'eth_btc_price_ratio', 'btc_market_cap', 'eth_market_cap',
+                 'eth_btc_market_cap_ratio', 'btc_24h_change', 'eth_24h_change', 'btc_volume', 'eth_volume')
+
+# CoinGecko market_chart rows: [timestamp_ms, value]
+MARKET_CHART_DTYPE = np.dtype([('ts', 'i8'), ('value', 'f8')])
+
+def parse_json(payload: bytes):
+    """Parse a JSON document from raw bytes"""
+    return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `acquire()` blocks until a token is available.
+    Tokens refill at `rate` per second up to `burst`, so short bursts pass immediately and sustained load is smoothed.
+    """
+    def __init__(self, rate: float = 25 / 60, burst: int = 5):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is this caller's wait; holding the lock keeps later callers queued behind it
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if wait:
+                time.sleep(wait)
+
 class ETHBTCMarketCapAnalyzer:
+    # CoinGecko free tier allows ~30 requests/minute per IP, shared by every analyzer in the process
+    _cg_bucket = TokenBucket(rate=25 / 60, burst=5)
+    
     def __init__(self, use_testnet: bool = False):
         """
         Initialize the ETH/BTC Market Cap Analyzer
@@ -20,49 +82,108 @@ class ETHBTCMarketCapAnalyzer:
         Args:
             use_testnet: Whether to use Binance testnet (default: False)
         """
-        self.exchange = ccxt.binance({
+        self._exchange_config = {
             'apiKey': '',  # Add your API key if needed for higher rate limits
             'secret': '',  # Add your secret if needed
-            'timeout': 30000,
-            'rateLimit': 1200,
-            'verbose': False,
+            'timeout': 15000,
+            # ccxt sleeps `rateLimit` ms between requests; Binance's public weight budget allows far more than 1 req/1.2 s
+            'enableRateLimit': True,
+            'rateLimit': 50,
             'sandbox': use_testnet,  # Use testnet if True
-        })
+        }
+        self.exchange = ccxt.binance(self._exchange_config)
+        # Worker-thread clients (see _client)
+        self._thread_clients = threading.local()
         
         # CoinGecko API for market cap data (free tier)
         self.coingecko_base_url = "https://api.coingecko.com/api/v3"
         
-    def get_current_market_data(self) -> Dict:
+        # Keep-alive session for CoinGecko; rate-limit and gateway errors are retried with backoff,
+        # and the last response is returned so the status checks below still report it
+        self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'ethbtc-analyzer/1.0'})
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+        
+        # On-disk cache of API responses shared across runs
+        self.cache = FileCache()
+        # Local snapshot lookups: filename -> (mtime, {ticker: row})
+        self._local_data_cache = {}
+        # Widest OHLCV frame fetched per (symbol, timeframe): (fetched_at_ms, since_ms, frame)
+        self._ohlcv_cache: Dict[Tuple[str, str], Tuple[int, int, pd.DataFrame]] = {}
+        
+    def _client(self) -> ccxt.Exchange:
         """
-        Get current market data for ETH and BTC including market cap
+        Binance client for the calling thread. The sync ccxt client's throttle, last-response fields and
+        market loading are not thread-safe, so each worker thread gets its own (reusing loaded markets).
         """
-        try:
-            # Get current prices from Binance
-            eth_btc_ticker = self.exchange.fetch_ticker('ETH/BTC')
-            btc_usdt_ticker = self.exchange.fetch_ticker('BTC/USDT') 
-            eth_usdt_ticker = self.exchange.fetch_ticker('ETH/USDT')
-            
-            # Get market cap data from CoinGecko
-            coins_url = f"{self.coingecko_base_url}/simple/price"
-            params = {
-                'ids': 'bitcoin,ethereum',
-                'vs_currencies': 'usd',
-                'include_market_cap': 'true',
-                'include_24hr_vol': 'true',
-                'include_24hr_change': 'true'
-            }
-            
-            response = requests.get(coins_url, params=params)
-            
+        if threading.current_thread() is threading.main_thread():
+            return self.exchange
+        client = getattr(self._thread_clients, 'exchange', None)
+        if client is None:
+            client = ccxt.binance(self._exchange_config)
+            if self.exchange.markets:
+                client.set_markets(self.exchange.markets, self.exchange.currencies)
+            self._thread_clients.exchange = client
+        return client
+    
+    def _get_simple_price(self) -> Optional[Dict]:
+        """
+        Fetch CoinGecko simple/price (price, market cap, 24h volume and change) for BTC and ETH
+        
+        Returns:
+            Parsed JSON with 'bitcoin' and 'ethereum' entries, or None if the API failed
+        """
+        coins_url = f"{self.coingecko_base_url}/simple/price"
+        params = {
+            'ids': 'bitcoin,ethereum',
+            'vs_currencies': 'usd',
+            'include_market_cap': 'true',
+            'include_24hr_vol': 'true',
+            'include_24hr_change': 'true'
+        }
+        
+        def fetch_market_data():
+            self._cg_bucket.acquire()
+            response = self.session.get(coins_url, params=params, timeout=15)
             if response.status_code != 200:
                 print(f"CoinGecko API Error: {response.status_code} - {response.text}")
                 return None
-                
-            market_data = response.json()
-            print(f"Market data keys: {list(market_data.keys())}")
+            return parse_json(response.content)
+        
+        try:
+            market_data = self.cache.get_or_fetch(coins_url, params, SIMPLE_PRICE_TTL, fetch_market_data)
+        except Exception as e:
+            print(f"Error fetching CoinGecko market data: {e}")
+            return None
+        if market_data is None:
+            return None
+            
+        print(f"Market data keys: {list(market_data.keys())}")
+        
+        if 'bitcoin' not in market_data or 'ethereum' not in market_data:
+            print(f"Missing expected data in response: {market_data}")
+            return None
+        return market_data
+
+    def get_current_market_data(self, market_data: Optional[Dict] = None) -> Dict:
+        """
+        Get current market data for ETH and BTC including market cap
+        
+        Args:
+            market_data: CoinGecko simple/price payload already fetched by the caller (fetched here if None)
+        """
+        try:
+            # Get current prices from Binance in one request
+            tickers = self._client().fetch_tickers(['ETH/BTC', 'BTC/USDT', 'ETH/USDT'])
+            eth_btc_ticker = tickers['ETH/BTC']
+            btc_usdt_ticker = tickers['BTC/USDT']
+            eth_usdt_ticker = tickers['ETH/USDT']
             
-            if 'bitcoin' not in market_data or 'ethereum' not in market_data:
-                print(f"Missing expected data in response: {market_data}")
+            # Get market cap data from CoinGecko
+            if market_data is None:
+                market_data = self._get_simple_price()
+            if market_data is None:
                 return None
             
             current_data = {
@@ -98,19 +219,97 @@ class ETHBTCMarketCapAnalyzer:
             DataFrame with OHLCV data
         """
         try:
-            since = self.exchange.milliseconds() - (days * 24 * 60 * 60 * 1000)
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since)
-            
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
+            exchange = self._client()
+            now = exchange.milliseconds()
+            since = now - (days * 24 * 60 * 60 * 1000)
+            
+            # Serve from memory while the newest candle cannot have closed yet and the cached window covers `since`
+            key = (symbol, timeframe)
+            cached = self._ohlcv_cache.get(key)
+            if cached is not None:
+                fetched_at, cached_since, cached_df = cached
+                if now - fetched_at < exchange.parse_timeframe(timeframe) * 1000 and cached_since <= since:
+                    return cached_df[cached_df.index >= pd.Timestamp(since, unit='ms')]
+            
+            ohlcv = self._fetch_ohlcv_cached(symbol, timeframe, since)
+            
+            # One float64 block, sliced into columns; millisecond timestamps are exact in float64
+            arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+            index = pd.DatetimeIndex(arr[:, 0].astype(np.int64).astype('datetime64[ms]'), name='timestamp')
+            df = pd.DataFrame({
+                'open': arr[:, 1],
+                'high': arr[:, 2],
+                'low': arr[:, 3],
+                'close': arr[:, 4],
+                'volume': arr[:, 5]
+            }, index=index)
+            
+            # A miss means the entry was stale or narrower, so the new window always replaces it
+            self._ohlcv_cache[key] = (now, since, df)
             return df
             
         except Exception as e:
             print(f"Error fetching historical data for {symbol}: {e}")
             return pd.DataFrame()
 
+    def _get_market_chart(self, coin_id: str, label: str, days: int, interval: str) -> Optional[Dict]:
+        """
+        Fetch one coin's CoinGecko market_chart payload
+        
+        Returns:
+            Parsed JSON, or None if the API answered with an error
+        """
+        url = f"{self.coingecko_base_url}/coins/{coin_id}/market_chart"
+        params = {'vs_currency': 'usd', 'days': days, 'interval': interval}
+        print(f"Fetching {label} data with params: {params}")
+        
+        def fetch_chart():
+            self._cg_bucket.acquire()
+            response = self.session.get(url, params=params, timeout=15)
+            if response.status_code != 200:
+                print(f"{label} API Error: {response.status_code} - {response.text}")
+                return None
+            return parse_json(response.content)
+        
+        data = self.cache.get_or_fetch(url, params, MARKET_CHART_TTL, fetch_chart)
+        if data is None:
+            return None
+        print(f"{label} API Response keys: {list(data.keys())}")
+        return data
+
+    def _fetch_ohlcv_paged(self, symbol: str, timeframe: str, since: int, limit: int = 1000) -> List[List]:
+        """
+        All candles from `since` (ms) up to now. Binance returns at most `limit` candles per request,
+        so request consecutive pages until a short page shows the history is exhausted.
+        """
+        exchange = self._client()
+        timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+        rows = []
+        while True:
+            chunk = exchange.fetch_ohlcv(symbol, timeframe, since, limit=limit)
+            rows += chunk
+            if len(chunk) < limit:
+                return rows
+            since = chunk[-1][0] + timeframe_ms
+
+    def _fetch_ohlcv_cached(self, symbol: str, timeframe: str, since: int) -> List[List]:
+        """
+        Candles from `since` (ms), reusing closed candles from the file cache.
+        Only the last two cached candles (the newest may still have been open) and anything later are requested again.
+        """
+        params = {'symbol': symbol, 'timeframe': timeframe}
+        cached = self.cache.get('binance/ohlcv', params) or []
+        
+        if len(cached) > 2 and cached[0][0] <= since:
+            refetch_from = cached[-2][0]
+            rows = [row for row in cached if row[0] < refetch_from]
+            rows += self._fetch_ohlcv_paged(symbol, timeframe, refetch_from)
+        else:
+            rows = self._fetch_ohlcv_paged(symbol, timeframe, since)
+        
+        self.cache.set('binance/ohlcv', params, rows)
+        return [row for row in rows if row[0] >= since]
+
     def get_historical_market_cap_data(self, days: int = 365) -> pd.DataFrame:
         """
         Get historical market cap data for ETH and BTC from CoinGecko
@@ -134,44 +333,34 @@ class ETHBTCMarketCapAnalyzer:
                 print("   • Alternative: Use historical CSV data from CoinMarketCap or other sources")
                 print("   • Current analysis shows last 365 days trends")
             
-            # Get BTC historical market cap
-            btc_url = f"{self.coingecko_base_url}/coins/bitcoin/market_chart"
-            btc_params = {'vs_currency': 'usd', 'days': days_param, 'interval': interval}
-            print(f"Fetching BTC data with params: {btc_params}")
-            btc_response = requests.get(btc_url, params=btc_params)
-            
-            if btc_response.status_code != 200:
-                print(f"BTC API Error: {btc_response.status_code} - {btc_response.text}")
-                return pd.DataFrame()
-                
-            btc_data = btc_response.json()
-            print(f"BTC API Response keys: {list(btc_data.keys())}")
-            
-            # Get ETH historical market cap  
-            eth_url = f"{self.coingecko_base_url}/coins/ethereum/market_chart"
-            eth_params = {'vs_currency': 'usd', 'days': days_param, 'interval': interval}
-            print(f"Fetching ETH data with params: {eth_params}")
-            eth_response = requests.get(eth_url, params=eth_params)
+            # Get BTC and ETH historical market caps concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                btc_future = executor.submit(self._get_market_chart, 'bitcoin', 'BTC', days_param, interval)
+                eth_future = executor.submit(self._get_market_chart, 'ethereum', 'ETH', days_param, interval)
+                btc_data = btc_future.result()
+                eth_data = eth_future.result()
             
-            if eth_response.status_code != 200:
-                print(f"ETH API Error: {eth_response.status_code} - {eth_response.text}")
+            if btc_data is None or eth_data is None:
                 return pd.DataFrame()
-                
-            eth_data = eth_response.json()
-            print(f"ETH API Response keys: {list(eth_data.keys())}")
             
-            # Process data
-            btc_df = pd.DataFrame(btc_data['market_caps'], columns=['timestamp', 'btc_market_cap'])
-            btc_df['timestamp'] = pd.to_datetime(btc_df['timestamp'], unit='ms')
+            # Process data: [timestamp_ms, market_cap] pairs as typed (int64, float64) record arrays
+            btc_caps, eth_caps = btc_data['market_caps'], eth_data['market_caps']
+            btc = np.fromiter(((row[0], row[1]) for row in btc_caps), dtype=MARKET_CHART_DTYPE, count=len(btc_caps))
+            eth = np.fromiter(((row[0], row[1]) for row in eth_caps), dtype=MARKET_CHART_DTYPE, count=len(eth_caps))
+            btc_index = pd.to_datetime(btc['ts'], unit='ms').rename('timestamp')
             
-            eth_df = pd.DataFrame(eth_data['market_caps'], columns=['timestamp', 'eth_market_cap'])
-            eth_df['timestamp'] = pd.to_datetime(eth_df['timestamp'], unit='ms')
+            # Align on timestamp; the daily series normally share every timestamp, so no join is needed
+            if np.array_equal(btc['ts'], eth['ts']):
+                market_cap_df = pd.DataFrame({'btc_market_cap': btc['value'], 'eth_market_cap': eth['value']}, index=btc_index)
+            else:
+                eth_index = pd.to_datetime(eth['ts'], unit='ms').rename('timestamp')
+                market_cap_df = pd.DataFrame({'btc_market_cap': btc['value']}, index=btc_index).join(
+                    pd.DataFrame({'eth_market_cap': eth['value']}, index=eth_index), how='inner')
             
-            # Merge data
-            market_cap_df = pd.merge(btc_df, eth_df, on='timestamp', how='inner')
-            market_cap_df['eth_btc_market_cap_ratio'] = market_cap_df['eth_market_cap'] / market_cap_df['btc_market_cap']
-            market_cap_df['btc_eth_market_cap_ratio'] = market_cap_df['btc_market_cap'] / market_cap_df['eth_market_cap']
-            market_cap_df.set_index('timestamp', inplace=True)
+            # One division; the inverse ratio is its reciprocal
+            ratio = np.divide(market_cap_df['eth_market_cap'].to_numpy(), market_cap_df['btc_market_cap'].to_numpy())
+            market_cap_df['eth_btc_market_cap_ratio'] = ratio
+            market_cap_df['btc_eth_market_cap_ratio'] = np.reciprocal(ratio)
             
             # Data is already filtered to the requested time range by the API
             
@@ -192,11 +381,20 @@ class ETHBTCMarketCapAnalyzer:
             Dictionary with BTC and ETH market cap data
         """
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # The ticker index is rebuilt only when the file changes
+            mtime = os.path.getmtime(filename)
+            cached = self._local_data_cache.get(filename)
+            if cached is not None and cached[0] == mtime:
+                by_ticker = cached[1]
+            else:
+                with open(filename, 'rb') as f:
+                    data = parse_json(f.read())
+                # Built in reverse so the first row wins for a duplicated ticker
+                by_ticker = {item['ticker']: item for item in reversed(data)}
+                self._local_data_cache[filename] = (mtime, by_ticker)
             
-            btc_data = next((item for item in data if item['ticker'] == 'BTC'), None)
-            eth_data = next((item for item in data if item['ticker'] == 'ETH'), None)
+            btc_data = by_ticker.get('BTC')
+            eth_data = by_ticker.get('ETH')
             
             if btc_data and eth_data:
                 return {
@@ -215,27 +413,51 @@ class ETHBTCMarketCapAnalyzer:
             print(f"Error loading local market cap data: {e}")
             return None
 
-    def create_comprehensive_chart(self, days: int = 365, save_chart: bool = True) -> None:
+    async def _fetch_all(self, days: int, market_data: Optional[Dict]) -> Tuple:
+        """
+        Fetch the three price histories, the current tickers and the market cap history concurrently.
+        The blocking HTTP clients run in worker threads (each with its own Binance client, see _client),
+        so the wait is roughly the slowest call.
+        Without a CoinGecko `market_data` payload the market cap history and current data are skipped.
+        """
+        fetches = [
+            asyncio.to_thread(self.get_historical_ohlcv, 'ETH/BTC', '1d', days),
+            asyncio.to_thread(self.get_historical_ohlcv, 'BTC/USDT', '1d', days),
+            asyncio.to_thread(self.get_historical_ohlcv, 'ETH/USDT', '1d', days),
+        ]
+        if market_data is None:
+            return (*await asyncio.gather(*fetches), pd.DataFrame(), None)
+        
+        fetches.append(asyncio.to_thread(self.get_historical_market_cap_data, days))
+        fetches.append(asyncio.to_thread(self.get_current_market_data, market_data))
+        return tuple(await asyncio.gather(*fetches))
+
+    def create_comprehensive_chart(self, days: int = 365, save_chart: bool = True, dpi: int = 150) -> None:
         """
         Create a comprehensive ETH/BTC analysis chart with both price and market cap ratios
         
         Args:
             days: Number of days of historical data (default: 365 = max for free tier)
             save_chart: Whether to save the chart as PNG
+            dpi: Output resolution (render cost grows quadratically; use 300 for print quality)
         """
-        # Get historical price data
-        print("Fetching historical price data...")
-        eth_btc_price_df = self.get_historical_ohlcv('ETH/BTC', '1d', days)
-        btc_usd_df = self.get_historical_ohlcv('BTC/USDT', '1d', days)
-        eth_usd_df = self.get_historical_ohlcv('ETH/USDT', '1d', days)
-        
-        # Get historical market cap data
-        print("Fetching historical market cap data...")
-        market_cap_df = self.get_historical_market_cap_data(days)
-        
-        # Get current data
+        # Phase 1: the cheap CoinGecko simple/price call doubles as a health probe for that API.
+        # A failure (typically a 429) gets one more try, which waits on the shared rate limiter.
         print("Fetching current market data...")
-        current_data = self.get_current_market_data()
+        market_data = self._get_simple_price()
+        if market_data is None:
+            print("Retrying CoinGecko market data once...")
+            market_data = self._get_simple_price()
+        
+        # Phase 2: historical prices, Binance tickers and market caps in one concurrent batch.
+        # The market cap history comes from the same CoinGecko API, so skip it while that is failing.
+        print("Fetching historical price data...")
+        if market_data is not None:
+            print("Fetching historical market cap data...")
+        else:
+            print("⚠️  CoinGecko unavailable, skipping historical market cap data")
+        (eth_btc_price_df, btc_usd_df, eth_usd_df,
+         market_cap_df, current_data) = asyncio.run(self._fetch_all(days, market_data))
         
         # Load local data for comparison
         local_data = self.load_local_market_cap_data()
@@ -247,18 +469,24 @@ class ETHBTCMarketCapAnalyzer:
         if market_cap_df.empty:
             print("Warning: Historical market cap data unavailable, creating simplified chart...")
             # Create simplified chart with just price data
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8), layout='constrained')
             fig.suptitle('ETH vs BTC Analysis - Price Data Only (Historical Market Cap Data Unavailable)', fontsize=16, fontweight='bold')
         else:
             # Create 3-panel chart: Price Ratio, USD Prices, Market Caps with Ratio Overlay
-            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 8))
+            fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(24, 8), layout='constrained')
             fig.suptitle(f'ETH vs BTC Analysis - Market Cap Ratio Insights (Last {len(market_cap_df)} Days)', fontsize=16, fontweight='bold')
+            
+            # Scale market caps to trillions once, as columns reused by every redraw
+            market_cap_df['btc_mc_t'] = market_cap_df['btc_market_cap'].to_numpy() * 1e-12
+            market_cap_df['eth_mc_t'] = market_cap_df['eth_market_cap'].to_numpy() * 1e-12
         
         # Chart creation is now handled above based on data availability
+        # Leave the bottom of the figure free for the summary statistics box
+        fig.get_layout_engine().set(rect=(0, 0.15, 1, 0.85))
         
         # Chart 1: ETH/BTC Price Ratio
         ax1.plot(eth_btc_price_df.index, eth_btc_price_df['close'], 
-                color='purple', linewidth=2, label='ETH/BTC Price Ratio')
+                color='purple', linewidth=2, label='ETH/BTC Price Ratio', rasterized=True)
         ax1.set_title('ETH/BTC Price Ratio', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Price Ratio', fontsize=12)
         ax1.grid(True, alpha=0.3)
@@ -276,9 +504,9 @@ class ETHBTCMarketCapAnalyzer:
         ax2_twin = ax2.twinx()
         
         line1 = ax2.plot(btc_usd_df.index, btc_usd_df['close'], 
-                        color='orange', linewidth=2, label='BTC Price (USD)')
+                        color='orange', linewidth=2, label='BTC Price (USD)', rasterized=True)
         line2 = ax2_twin.plot(eth_usd_df.index, eth_usd_df['close'], 
-                             color='blue', linewidth=2, label='ETH Price (USD)')
+                             color='blue', linewidth=2, label='ETH Price (USD)', rasterized=True)
         
         ax2.set_title('BTC and ETH USD Prices', fontsize=14, fontweight='bold')
         ax2.set_ylabel('BTC Price (USD)', fontsize=12, color='orange')
@@ -294,21 +522,45 @@ class ETHBTCMarketCapAnalyzer:
         
         # Chart 3: Market Cap Values with ETH/BTC Ratio Overlay (only if market cap data available)
         if not market_cap_df.empty:
-            # Left y-axis: BTC Market Cap
-            ax3.plot(market_cap_df.index, market_cap_df['btc_market_cap'] / 1e12, 
-                    color='orange', linewidth=2.5, label='BTC Market Cap (T USD)')
-            
-            # First twin y-axis: ETH Market Cap  
+            # All three series are drawn on ax3 as one LineCollection: BTC market cap in its own units,
+            # ETH market cap and the ratio mapped linearly onto the BTC range. The twin axes carry no data,
+            # only the tick scales of the mapped series.
+            btc_mc = market_cap_df['btc_mc_t'].to_numpy()
+            eth_mc = market_cap_df['eth_mc_t'].to_numpy()
+            mc_ratio = market_cap_df['eth_btc_market_cap_ratio'].to_numpy()
+            base_lo, base_hi = np.nanmin(btc_mc), np.nanmax(btc_mc)
+            base_span = (base_hi - base_lo) or 1.0
+            
+            def value_range(values, extra=()):
+                lo, hi = np.nanmin([*values, *extra]), np.nanmax([*values, *extra])
+                return lo, (hi - lo) or 1.0
+            
+            eth_lo, eth_span = value_range(eth_mc)
+            ratio_lo, ratio_span = value_range(mc_ratio, [current_data['eth_btc_market_cap_ratio']] if current_data else [])
+            
+            def to_base(values, lo, span):
+                return base_lo + (values - lo) * (base_span / span)
+            
+            x = mdates.date2num(market_cap_df.index)
+            series_styles = [
+                (btc_mc, 'orange', 2.5, '-', 1.0, 'BTC Market Cap (T USD)'),
+                (to_base(eth_mc, eth_lo, eth_span), 'blue', 2.5, '-', 1.0, 'ETH Market Cap (T USD)'),
+                (to_base(mc_ratio, ratio_lo, ratio_span), 'purple', 3, '--', 0.8, 'ETH/BTC Market Cap Ratio'),
+            ]
+            ax3.add_collection(LineCollection(
+                [np.column_stack((x, y)) for y, *_ in series_styles],
+                colors=[to_rgba(color, alpha) for _, color, _, _, alpha, _ in series_styles],
+                linewidths=[width for _, _, width, *_ in series_styles],
+                linestyles=[style for _, _, _, style, *_ in series_styles],
+                rasterized=True))
+            ax3.autoscale_view()
+            
+            # First twin y-axis: ETH Market Cap scale
             ax3_twin1 = ax3.twinx()
-            ax3_twin1.plot(market_cap_df.index, market_cap_df['eth_market_cap'] / 1e12,
-                          color='blue', linewidth=2.5, label='ETH Market Cap (T USD)')
             
-            # Second twin y-axis: ETH/BTC Market Cap Ratio
+            # Second twin y-axis: ETH/BTC Market Cap Ratio scale
             ax3_twin2 = ax3.twinx()
             ax3_twin2.spines['right'].set_position(('outward', 60))  # Offset the second twin axis
-            ax3_twin2.plot(market_cap_df.index, market_cap_df['eth_btc_market_cap_ratio'],
-                          color='purple', linewidth=3, alpha=0.8, linestyle='--', 
-                          label='ETH/BTC Market Cap Ratio')
             
             ax3.set_title('Market Caps with ETH/BTC Ratio Overlay', fontsize=14, fontweight='bold')
             ax3.set_ylabel('BTC Market Cap (Trillion USD)', fontsize=12, color='orange')
@@ -320,19 +572,23 @@ class ETHBTCMarketCapAnalyzer:
             ax3_twin2.tick_params(axis='y', labelcolor='purple')
             ax3.grid(True, alpha=0.3)
             
-            # Combine all legends
-            lines1, labels1 = ax3.get_legend_handles_labels()
-            lines2, labels2 = ax3_twin1.get_legend_handles_labels()
-            lines3, labels3 = ax3_twin2.get_legend_handles_labels()
-            ax3.legend(lines1 + lines2 + lines3, labels1 + labels2 + labels3, loc='upper left')
+            # Legend entries for the collection's three lines
+            ax3.legend([Line2D([], [], color=color, linewidth=width, linestyle=style, alpha=alpha)
+                        for _, color, width, style, alpha, _ in series_styles],
+                       [label for *_, label in series_styles], loc='upper left')
             
             # Add current ratio annotation
             if current_data:
                 current_mc_ratio = current_data['eth_btc_market_cap_ratio']
-                ax3_twin2.axhline(y=current_mc_ratio, color='purple', linestyle=':', alpha=0.8)
+                ax3.axhline(y=to_base(current_mc_ratio, ratio_lo, ratio_span), color='purple', linestyle=':', alpha=0.8)
                 ax3.text(0.02, 0.98, f'Current ETH/BTC Ratio: {current_mc_ratio:.4f}', 
                         transform=ax3.transAxes, verticalalignment='top',
                         bbox=dict(boxstyle='round', facecolor='plum', alpha=0.7))
+            
+            # Twin scales show the mapped series' values across ax3's final y-limits
+            y_lo, y_hi = ax3.get_ylim()
+            for twin, lo, span in ((ax3_twin1, eth_lo, eth_span), (ax3_twin2, ratio_lo, ratio_span)):
+                twin.set_ylim(lo + (y_lo - base_lo) * (span / base_span), lo + (y_hi - base_lo) * (span / base_span))
         
         # Format x-axes for all charts
         axes_to_format = [ax1, ax2]
@@ -378,51 +634,69 @@ Note: Live API data unavailable"""
                     bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8),
                     verticalalignment='bottom')
         
-        plt.tight_layout()
-        plt.subplots_adjust(top=0.90, bottom=0.15, right=0.85)
-        
         if save_chart:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"eth_btc_market_cap_analysis_{timestamp}.png"
-            plt.savefig(filename, dpi=300, bbox_inches='tight')
+            plt.savefig(filename, dpi=dpi, bbox_inches='tight')
             print(f"Chart saved as: {filename}")
         
         plt.show()
+        plt.close(fig)
 
-    def get_real_time_data_stream(self, duration_minutes: int = 60) -> None:
+    async def _poll_market_data(self, end_time: float, poll_interval: float,
+                                timestamps: np.ndarray, values: np.ndarray) -> None:
+        """
+        Fetch current data on a fixed wall-clock cadence until `end_time`, filling the preallocated
+        `timestamps` (NaT = unused) and `values` (one row of STREAM_FIELDS per fetch) in order.
+        The wait after each fetch is shortened by the time the fetch took, so slow responses do not drift the schedule.
+        """
+        loop = asyncio.get_running_loop()
+        next_fetch = loop.time()
+        n = 0
+        
+        while time.time() < end_time and n < len(timestamps):
+            current_data = await asyncio.to_thread(self.get_current_market_data)
+            
+            if current_data:
+                values[n] = [current_data[field] for field in STREAM_FIELDS]
+                timestamps[n] = np.datetime64(current_data['timestamp'], 'ns')
+                n += 1
+                
+                print(f"[{current_data['timestamp'].strftime('%H:%M:%S')}] "
+                      f"ETH/BTC Price: {current_data['eth_btc_price_ratio']:.6f} | "
+                      f"Market Cap Ratio: {current_data['eth_btc_market_cap_ratio']:.4f}")
+            
+            next_fetch += poll_interval
+            await asyncio.sleep(max(0.0, next_fetch - loop.time()))
+
+    def get_real_time_data_stream(self, duration_minutes: int = 60, poll_interval: float = 60) -> None:
         """
         Stream real-time ETH/BTC market cap ratio data
         
         Args:
             duration_minutes: How long to stream data (in minutes)
+            poll_interval: Seconds between fetches (CoinGecko's free tier allows ~30 requests/minute)
         """
         print(f"Starting real-time data stream for {duration_minutes} minutes...")
         
         start_time = time.time()
         end_time = start_time + (duration_minutes * 60)
         
-        data_points = []
+        # At most one fetch per tick, plus the one at the start
+        capacity = int(duration_minutes * 60 // poll_interval) + 1
+        timestamps = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[ns]')
+        values = np.empty((capacity, len(STREAM_FIELDS)))
         
         try:
-            while time.time() < end_time:
-                current_data = self.get_current_market_data()
-                
-                if current_data:
-                    data_points.append(current_data)
-                    
-                    print(f"[{current_data['timestamp'].strftime('%H:%M:%S')}] "
-                          f"ETH/BTC Price: {current_data['eth_btc_price_ratio']:.6f} | "
-                          f"Market Cap Ratio: {current_data['eth_btc_market_cap_ratio']:.4f}")
-                
-                time.sleep(60)  # Update every minute
-                
+            asyncio.run(self._poll_market_data(end_time, poll_interval, timestamps, values))
         except KeyboardInterrupt:
             print("\nReal-time stream stopped by user")
         
-        if data_points:
+        n = int(np.count_nonzero(~np.isnat(timestamps)))
+        if n:
             # Create a quick chart of the real-time data
-            df = pd.DataFrame(data_points)
-            df.set_index('timestamp', inplace=True)
+            df = pd.DataFrame(values[:n], columns=list(STREAM_FIELDS),
+                              index=pd.DatetimeIndex(timestamps[:n], name='timestamp'))
             
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
             
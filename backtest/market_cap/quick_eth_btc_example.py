@@ -23,9 +23,10 @@ def get_quick_eth_btc_market_cap_ratio():
         
         # Get current prices from Binance
         print("Fetching current prices from Binance...")
-        eth_btc_ticker = exchange.fetch_ticker('ETH/BTC')
-        btc_ticker = exchange.fetch_ticker('BTC/USDT')
-        eth_ticker = exchange.fetch_ticker('ETH/USDT')
+        tickers = exchange.fetch_tickers(['ETH/BTC', 'BTC/USDT', 'ETH/USDT'])
+        eth_btc_ticker = tickers['ETH/BTC']
+        btc_ticker = tickers['BTC/USDT']
+        eth_ticker = tickers['ETH/USDT']
         
         # Get market cap data from CoinGecko (free API)
         print("Fetching market cap data from CoinGecko...")
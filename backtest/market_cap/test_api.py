@@ -5,6 +5,10 @@ Simple test script to debug CoinGecko API issues
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# One keep-alive connection for all probes
+session = requests.Session()
 
 def test_coingecko_simple_api():
     """Test the simple price API"""
@@ -18,7 +22,7 @@ def test_coingecko_simple_api():
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params, timeout=15)
         print(f"Status Code: {response.status_code}")
         print(f"URL: {response.url}")
         
@@ -56,34 +60,41 @@ def test_coingecko_market_chart():
         {'days': 'max', 'interval': 'daily'},
     ]
     
-    for params in test_params:
-        print(f"\nTesting with params: {params}")
-        url = "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart"
-        params_full = {'vs_currency': 'usd', **params}
-        
-        try:
-            response = requests.get(url, params=params_full)
-            print(f"Status Code: {response.status_code}")
-            print(f"URL: {response.url}")
+    url = "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart"
+    
+    def probe(params):
+        return session.get(url, params={'vs_currency': 'usd', **params}, timeout=15)
+    
+    # Probes run concurrently; each result is printed as it arrives, tagged with its params
+    with ThreadPoolExecutor(max_workers=len(test_params)) as executor:
+        futures = {executor.submit(probe, params): params for params in test_params}
+        for future in as_completed(futures):
+            params = futures[future]
+            print(f"\nTesting with params: {params}")
             
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Response Keys: {list(data.keys())}")
+            try:
+                response = future.result()
+                print(f"{params} Status Code: {response.status_code}")
+                print(f"{params} URL: {response.url}")
                 
-                if 'market_caps' in data:
-                    print(f"Market Caps Data Points: {len(data['market_caps'])}")
-                    print(f"First Entry: {data['market_caps'][0]}")
-                    print(f"Last Entry: {data['market_caps'][-1]}")
+                if response.status_code == 200:
+                    data = response.json()
+                    print(f"{params} Response Keys: {list(data.keys())}")
+                    
+                    if 'market_caps' in data:
+                        print(f"{params} Market Caps Data Points: {len(data['market_caps'])}")
+                        print(f"{params} First Entry: {data['market_caps'][0]}")
+                        print(f"{params} Last Entry: {data['market_caps'][-1]}")
+                    else:
+                        print(f"{params} No 'market_caps' key. Full response: {json.dumps(data, indent=2)[:500]}...")
+                        
                 else:
-                    print(f"No 'market_caps' key. Full response: {json.dumps(data, indent=2)[:500]}...")
+                    print(f"{params} Error: {response.text}")
                     
-            else:
-                print(f"Error: {response.text}")
-                
-        except Exception as e:
-            print(f"Exception: {e}")
-        
-        print("-" * 30)
+            except Exception as e:
+                print(f"{params} Exception: {e}")
+            
+            print("-" * 30)
 
 if __name__ == "__main__":
     test_coingecko_simple_api()
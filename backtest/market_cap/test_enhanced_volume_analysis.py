@@ -31,7 +31,8 @@ def test_ccxt_integration():
                     symbol=test_case['symbol'],
                     timeframe=test_case['timeframe'],
                     limit=test_case['limit'],
-                    exchange=test_case['exchange']
+                    exchange=test_case['exchange'],
+                    use_cache=True
                 )
                 
                 print(f"✅ Successfully fetched {len(data)} candles")
@@ -109,7 +110,7 @@ def test_complete_analysis():
         
         try:
             # Try CCXT first
-            data = analyzer.fetch_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=200, exchange='binance')
+            data = analyzer.fetch_data_ccxt(symbol='BTC/USDT', timeframe='1d', limit=200, exchange='binance', use_cache=True)
         except:
             # Fallback to CSV
             print("CCXT failed, falling back to CSV...")
@@ -3,11 +3,44 @@
 Test Enhanced Volume Strategy on ETH/USDT over 5 years
 """
 
-from enhanced_volume_analysis import EnhancedVolumeProfileAnalyzer
+from enhanced_volume_analysis import (EnhancedVolumeProfileAnalyzer, backtest_strategies,
+                                      get_cached_ohlcv, cache_ohlcv, ohlcv_to_frame)
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import asyncio
+import ccxt.async_support as ccxt_async
+
+async def _race_fetch(symbol, timeframe, limit, exchanges):
+    """
+    Request the candles from every exchange at once and return (exchange, ohlcv) for the first exchange,
+    in `exchanges` order, that succeeds. A failing exchange costs no extra wait; the rest are cancelled.
+    A fresh entry in the shared OHLCV file cache is used without any request, and the winner is cached.
+    """
+    for name in exchanges:
+        ohlcv = get_cached_ohlcv(name, symbol, timeframe, limit)
+        if ohlcv is not None:
+            return name, ohlcv
+    
+    clients = {name: getattr(ccxt_async, name)({'timeout': 30000, 'enableRateLimit': True}) for name in exchanges}
+    tasks = {name: asyncio.create_task(client.fetch_ohlcv(symbol, timeframe, limit=limit))
+             for name, client in clients.items()}
+    try:
+        for name, task in tasks.items():
+            try:
+                ohlcv = await task
+            except Exception as e:
+                print(f"   ❌ {name} failed: {e}")
+                continue
+            cache_ohlcv(name, symbol, timeframe, limit, ohlcv)
+            return name, ohlcv
+        raise Exception("Could not fetch data from any exchange")
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        await asyncio.gather(*(client.close() for client in clients.values()), return_exceptions=True)
 
 def test_eth_5year_strategy():
     """Test the enhanced strategy on ETH/USDT over 5 years"""
@@ -21,27 +54,14 @@ def test_eth_5year_strategy():
         # Fetch 5 years of daily data (roughly 1825 days)
         print("📡 Fetching 5 years of ETH/USDT data...")
         
-        # Try different exchanges to get maximum historical data
+        # Try different exchanges to get maximum historical data, all at once, preferring earlier ones
         exchanges_to_try = ['binance', 'coinbase', 'kraken', 'okx']
-        data = None
-        
-        for exchange in exchanges_to_try:
-            try:
-                print(f"   Trying {exchange}...")
-                data = analyzer.fetch_data_ccxt(
-                    symbol='ETH/USDT', 
-                    timeframe='1d', 
-                    limit=1825,  # 5 years of daily data
-                    exchange=exchange
-                )
-                print(f"✅ Successfully fetched from {exchange}")
-                break
-            except Exception as e:
-                print(f"   ❌ {exchange} failed: {e}")
-                continue
+        print(f"   Trying {', '.join(exchanges_to_try)}...")
+        exchange, ohlcv = asyncio.run(_race_fetch('ETH/USDT', '1d', 1825, exchanges_to_try))  # 5 years of daily data
+        print(f"✅ Successfully fetched from {exchange}")
         
-        if data is None:
-            raise Exception("Could not fetch data from any exchange")
+        data = ohlcv_to_frame(ohlcv)
+        analyzer.load_data(data)
         
         # Data info
         print(f"\n📊 Data Summary:")
@@ -87,31 +107,26 @@ def test_eth_5year_strategy():
             }
         ]
         
+        # Features and volume profile depend only on the data, so build them once for all strategies
+        volume_features = analyzer.calculate_enhanced_volume_metrics()
+        
+        # Build volume profile with longer lookback for 5-year data
+        profile = analyzer.build_volume_profile(
+            lookback=min(500, len(data)-1),  # Longer lookback for 5-year data
+            rows=30
+        )
+        
         results = []
         portfolios = {}
         
-        for strategy in strategies:
+        # Backtests differ only in their parameters, so run them in parallel processes
+        sweep = backtest_strategies(analyzer, strategies, initial_capital=100000)
+        
+        for strategy, (portfolio, performance) in zip(strategies, sweep):
             print(f"\n🚀 Testing {strategy['name']} Strategy")
             print(f"   {strategy['description']}")
             print("-" * 40)
             
-            # Calculate enhanced volume metrics
-            volume_features = analyzer.calculate_enhanced_volume_metrics()
-            
-            # Build volume profile with longer lookback for 5-year data
-            profile = analyzer.build_volume_profile(
-                lookback=min(500, len(data)-1),  # Longer lookback for 5-year data
-                rows=30
-            )
-            
-            # Run backtest
-            portfolio, performance = analyzer.backtest_volume_strategy(
-                initial_capital=100000,
-                max_position_size=strategy['max_pos'],
-                stop_loss=strategy['stop_loss'],
-                take_profit=strategy['take_profit']
-            )
-            
             portfolios[strategy['name']] = portfolio
             
             # Calculate additional metrics for 5-year analysis
@@ -217,7 +232,7 @@ def create_performance_chart(portfolios, price_data, buy_hold_return):
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 12))
     
     # Price chart
-    ax1.plot(price_data.index, price_data['close'], label='ETH/USDT Price', color='orange', linewidth=2)
+    ax1.plot(price_data.index, price_data['close'], label='ETH/USDT Price', color='orange', linewidth=2, rasterized=True)
     ax1.set_title('ETH/USDT Price Over 5 Years', fontsize=14, fontweight='bold')
     ax1.set_ylabel('Price (USD)')
     ax1.legend()
@@ -229,13 +244,13 @@ def create_performance_chart(portfolios, price_data, buy_hold_return):
     for i, (strategy_name, portfolio) in enumerate(portfolios.items()):
         if 'cumulative_returns' in portfolio.columns:
             ax2.plot(portfolio.index, (portfolio['cumulative_returns'] - 1) * 100, 
-                    label=strategy_name, color=colors[i % len(colors)], linewidth=2)
+                    label=strategy_name, color=colors[i % len(colors)], linewidth=2, rasterized=True)
     
     # Add buy & hold line
     buy_hold_line = price_data['close'] / price_data['close'].iloc[0] - 1
     ax2.plot(price_data.index, buy_hold_line * 100, 
             label=f'Buy & Hold ({buy_hold_return:.1%})', 
-            color='black', linestyle='--', linewidth=2)
+            color='black', linestyle='--', linewidth=2, rasterized=True)
     
     ax2.set_title('Strategy Performance Comparison (5 Years)', fontsize=14, fontweight='bold')
     ax2.set_ylabel('Returns (%)')
@@ -245,7 +260,7 @@ def create_performance_chart(portfolios, price_data, buy_hold_return):
     ax2.axhline(y=0, color='gray', linestyle='-', alpha=0.5)
     
     plt.tight_layout()
-    plt.savefig('eth_5year_strategy_performance.png', dpi=300, bbox_inches='tight')
+    plt.savefig('eth_5year_strategy_performance.png', dpi=150, bbox_inches='tight')
     print("✅ Chart saved as 'eth_5year_strategy_performance.png'")
     
     return fig
@@ -3,7 +3,7 @@
 Quick test of the improved volume strategy
 """
 
-from enhanced_volume_analysis import EnhancedVolumeProfileAnalyzer, run_complete_analysis
+from enhanced_volume_analysis import EnhancedVolumeProfileAnalyzer, backtest_strategies, run_complete_analysis
 import matplotlib.pyplot as plt
 import pandas as pd
 
@@ -19,7 +19,7 @@ def test_improved_strategy():
         # Try to get live data first
         try:
             print("📡 Fetching live BTC data...")
-            data = analyzer.fetch_data_ccxt('BTC/USDT', '1d', 300, 'binance')
+            data = analyzer.fetch_data_ccxt('BTC/USDT', '1d', 300, 'binance', use_cache=True)
             data_source = "Live CCXT Data"
         except:
             print("📁 Loading CSV data...")
@@ -35,26 +35,19 @@ def test_improved_strategy():
             {"name": "Aggressive", "max_pos": 0.15, "stop_loss": 0.07, "take_profit": 0.20},
         ]
         
+        # Features and volume profile depend only on the data, so build them once for all strategies
+        volume_features = analyzer.calculate_enhanced_volume_metrics()
+        profile = analyzer.build_volume_profile(lookback=min(200, len(data)-1), rows=25)
+        
         results = []
         
-        for strategy in strategies:
+        # Backtests differ only in their parameters, so run them in parallel processes
+        sweep = backtest_strategies(analyzer, strategies, initial_capital=100000)
+        
+        for strategy, (portfolio, performance) in zip(strategies, sweep):
             print(f"\n📊 Testing {strategy['name']} Strategy...")
             print("-" * 30)
             
-            # Calculate enhanced volume metrics
-            volume_features = analyzer.calculate_enhanced_volume_metrics()
-            
-            # Build volume profile
-            profile = analyzer.build_volume_profile(lookback=min(200, len(data)-1), rows=25)
-            
-            # Run backtest with current parameters
-            portfolio, performance = analyzer.backtest_volume_strategy(
-                initial_capital=100000,
-                max_position_size=strategy['max_pos'],
-                stop_loss=strategy['stop_loss'],
-                take_profit=strategy['take_profit']
-            )
-            
             # Store results
             strategy_result = {
                 'name': strategy['name'],